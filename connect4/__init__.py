@@ -0,0 +1,23 @@
+"""Connect 4 engine: boards, search, solver and game logic, with no GUI
+dependency.
+
+The Tk interface lives in connect4.gui, and the tools in their own
+modules: connect4.batch (NumPy), selfplay, server, bench, book and
+endgame. Importing this package loads none of them.
+"""
+
+from .board import (BOARD_CLASSES, COLS, EMPTY, PLAYER1, PLAYER2, ROWS, BitBoard, Board,
+                    board_from_moves)
+from .errors import SearchCancelled, SearchTimeout
+from .game import AIPlayer, GameEngine, HumanPlayer
+from .records import EndgameTable, OpeningBook, load_opening_book
+from .search import Minimax, SearchStats
+from .solver import Solver, describe_solver_score
+from .tt import TranspositionTable
+
+__all__ = [
+    "ROWS", "COLS", "EMPTY", "PLAYER1", "PLAYER2", "BOARD_CLASSES", "Board", "BitBoard", "board_from_moves",
+    "SearchTimeout", "SearchCancelled", "TranspositionTable", "Minimax", "SearchStats",
+    "Solver", "describe_solver_score", "OpeningBook", "EndgameTable", "load_opening_book",
+    "HumanPlayer", "AIPlayer", "GameEngine",
+]
@@ -0,0 +1,100 @@
+"""Batched NumPy evaluation of many positions at once (NumPy is optional)."""
+
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the batch evaluation API needs it
+    np = None
+
+from .board import BIT_H, COLS, EMPTY, PLAYER1, PLAYER2, ROWS, WINDOW_CELLS, WINDOW_SCORES
+
+# ============================
+# BATCH EVALUATION (optional NumPy)
+# ============================
+# score_position and check_winner for many positions in a few array passes,
+# for leaf evaluation in batched searches, dataset labelling and bulk
+# analysis. Positions are either an (N, ROWS, COLS) int8 array of
+# EMPTY/PLAYER1/PLAYER2 (pack_grids) or an (N, 2) uint64 array of
+# (player 1 stones, occupied mask) bitboards (pack_masks).
+BATCH_CHUNK = 65_536  # positions per pass; bounds the temporary arrays
+
+if np is not None:
+    # row k holds the k-th cell of every window
+    BATCH_WINDOW_CELLS = np.array(WINDOW_CELLS, dtype=np.intp).T
+    BATCH_WINDOW_SCORES = np.array(WINDOW_SCORES, dtype=np.int32)
+    BATCH_CENTER_CELLS = np.array([r * COLS + COLS // 2 for r in range(ROWS)], dtype=np.intp)
+    # bit index of each flat cell r * COLS + c in the bitboard layout
+    BATCH_CELL_BITS = np.array([c * BIT_H + ROWS - 1 - r for r in range(ROWS) for c in range(COLS)],
+                               dtype=np.intp)
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("batch evaluation needs NumPy (pip install numpy)")
+
+def pack_grids(boards) -> "np.ndarray":
+    """(N, ROWS, COLS) int8 grids of `boards` (Board or BitBoard)."""
+    _require_numpy()
+    grids = np.zeros((len(boards), ROWS, COLS), dtype=np.int8)
+    for i, board in enumerate(boards):
+        grids[i] = [list(row) for row in board.grid]
+    return grids
+
+def pack_masks(boards) -> "np.ndarray":
+    """(N, 2) uint64 (player 1 stones, mask) bitboards of `boards`."""
+    _require_numpy()
+    masks = np.zeros((len(boards), 2), dtype=np.uint64)
+    for i, board in enumerate(boards):
+        masks[i] = board.stones(PLAYER1), board.mask
+    return masks
+
+def masks_to_grids(masks) -> "np.ndarray":
+    """(N, 2) (player 1 stones, mask) bitboards -> (N, ROWS, COLS) int8 grids."""
+    _require_numpy()
+    masks = np.ascontiguousarray(masks, dtype="<u8").reshape(-1, 2)
+    # every bit of both words as a 0/1 byte, then just the board cells
+    bits = np.unpackbits(masks.view(np.uint8).reshape(-1, 2, 8), axis=2, bitorder="little")
+    bits = bits[:, :, BATCH_CELL_BITS]
+    # 1 for player 1's stones, 2 for the rest of the mask
+    cells = 2 * bits[:, 1] - bits[:, 0]
+    return cells.view(np.int8).reshape(-1, ROWS, COLS)
+
+def batch_evaluate(positions, player=PLAYER1) -> Tuple["np.ndarray", "np.ndarray"]:
+    """score_position(player) and check_winner() of every position.
+
+    `positions` is an (N, ROWS, COLS) grid array or an (N, 2) mask array;
+    `player` is one id or an array of N. Returns (scores, winners): int32
+    scores and int8 winner ids, 0 where nobody has four.
+    """
+    _require_numpy()
+    positions = np.asarray(positions)
+    if positions.ndim == 3 and positions.shape[1:] == (ROWS, COLS):
+        cells = positions.reshape(-1, ROWS * COLS).astype(np.int8, copy=False)
+    elif positions.ndim == 2 and positions.shape[1] == 2:
+        cells = masks_to_grids(positions).reshape(-1, ROWS * COLS)
+    else:
+        raise ValueError(f"expected (N, {ROWS}, {COLS}) grids or (N, 2) masks, got shape {positions.shape}")
+    n = len(cells)
+    players = np.broadcast_to(np.asarray(player, dtype=np.intp), (n,))
+    scores = np.empty(n, dtype=np.int32)
+    winners = np.empty(n, dtype=np.int8)
+    for start in range(0, n, BATCH_CHUNK):
+        # cells x positions, so each step below works on contiguous rows
+        chunk = np.ascontiguousarray(cells[start:start + BATCH_CHUNK].T)
+        who = players[start:start + BATCH_CHUNK]
+        # base-3 window codes, as in init_eval_tracking: (69, chunk); at
+        # most 80, so int8 arithmetic is enough
+        a, b, c, d = (chunk[idx] for idx in BATCH_WINDOW_CELLS)
+        codes = a * np.int8(27) + b * np.int8(9) + c * np.int8(3) + d
+        part = BATCH_WINDOW_SCORES[who, codes].sum(axis=0)
+        part += 3 * (chunk[BATCH_CENTER_CELLS] == who).sum(axis=0)
+        scores[start:start + len(who)] = part
+        # code 40 is four PLAYER1 stones (1111 in base 3), 80 four PLAYER2
+        p1_wins = (codes == 40).any(axis=0)
+        p2_wins = (codes == 80).any(axis=0)
+        winners[start:start + len(who)] = np.where(p1_wins, PLAYER1, np.where(p2_wins, PLAYER2, EMPTY))
+    return scores, winners
+
+def evaluate_boards(boards, player=PLAYER1) -> Tuple["np.ndarray", "np.ndarray"]:
+    """batch_evaluate over a list of Board / BitBoard objects."""
+    return batch_evaluate(pack_masks(boards), player)
@@ -0,0 +1,613 @@
+"""Board and BitBoard: the position, move making, win checks and the static evaluation."""
+
+import random
+from typing import List, Tuple, Optional
+
+# ============================
+# CONSTANTS
+# ============================
+ROWS = 6
+COLS = 7
+EMPTY = 0
+PLAYER1 = 1
+PLAYER2 = 2
+
+# ============================
+# ZOBRIST HASHING
+# ============================
+# one random 64-bit number per (player, row, col); fixed seed so keys are
+# stable between runs
+_zobrist_rng = random.Random(0xC0FFEE4)
+ZOBRIST = [[[_zobrist_rng.getrandbits(64) for _ in range(COLS)] for _ in range(ROWS)]
+           for _ in range(3)]
+
+# ============================
+# WINDOW TABLES
+# ============================
+def _build_windows() -> List[List[Tuple[int, int]]]:
+    """All 69 four-cell windows, in the order Board.winning_positions scans them."""
+    windows = []
+    for r in range(ROWS):
+        for c in range(COLS - 3):
+            windows.append([(r, c + i) for i in range(4)])
+    for c in range(COLS):
+        for r in range(ROWS - 3):
+            windows.append([(r + i, c) for i in range(4)])
+    for r in range(ROWS - 3):
+        for c in range(COLS - 3):
+            windows.append([(r + i, c + i) for i in range(4)])
+    for r in range(3, ROWS):
+        for c in range(COLS - 3):
+            windows.append([(r - i, c + i) for i in range(4)])
+    return windows
+
+WINDOWS = _build_windows()
+# the same windows as flat cell indexes (r * COLS + c)
+WINDOW_CELLS = [tuple(r * COLS + c for r, c in w) for w in WINDOWS]
+# (r, c) of every flat cell; boards push these onto their move stacks
+# instead of allocating a tuple per move
+CELL_COORDS = [(r, c) for r in range(ROWS) for c in range(COLS)]
+# for every flat cell, the (window index, base-3 weight) of each window
+# containing it; at most 16 per cell
+CELL_WINDOWS: List[List[Tuple[int, int]]] = [[] for _ in range(ROWS * COLS)]
+for _w, _cells in enumerate(WINDOW_CELLS):
+    for _cell, _weight in zip(_cells, (27, 9, 3, 1)):
+        CELL_WINDOWS[_cell].append((_w, _weight))
+
+# ============================
+# BOARD
+# ============================
+class GridView:
+    """Read-only ``grid[r][c]`` view over a Board's flat cells; each row
+    is a bytes copy, so it supports indexing, count and iteration."""
+    __slots__ = ("_cells",)
+
+    def __init__(self, cells: bytearray):
+        self._cells = cells
+
+    def __len__(self):
+        return ROWS
+
+    def __getitem__(self, r: int) -> bytes:
+        if r < 0:
+            r += ROWS
+        if r < 0 or r >= ROWS:
+            raise IndexError("grid row out of range")
+        return bytes(self._cells[r * COLS:(r + 1) * COLS])
+
+    def __iter__(self):
+        return (self[r] for r in range(ROWS))
+
+class Board:
+    # __slots__ and byte arrays keep a board (and every copy the search
+    # makes) small: see run_memory_benchmark
+    __slots__ = ("cells", "last_move", "moves", "heights", "key", "mirror_key",
+                 "mask", "player_stones", "window_codes", "eval_scores")
+
+    def __init__(self):
+        # one byte per cell, r * COLS + c with row 0 at the top
+        self.cells = bytearray(ROWS * COLS)
+        self.last_move: Optional[Tuple[int, int]] = None
+        # move stack and per-column heights, used by undo_move
+        self.moves: List[Tuple[int, int]] = []
+        self.heights = bytearray(COLS)
+        # Zobrist hash of the position and of its left-right mirror, both
+        # updated by drop_piece / undo_move
+        self.key = 0
+        self.mirror_key = 0
+        # the same position as bitboards (see BITBOARD), for threat masks
+        # and win checks
+        self.mask = 0
+        self.player_stones = [0, 0, 0]
+        # incremental evaluation, see enable_eval_tracking
+        self.window_codes: Optional[List[int]] = None
+        self.eval_scores: Optional[List[int]] = None
+
+    def copy(self):
+        b = Board.__new__(Board)
+        b.cells = self.cells[:]
+        b.last_move = self.last_move
+        b.moves = self.moves[:]
+        b.heights = self.heights[:]
+        b.key = self.key
+        b.mirror_key = self.mirror_key
+        b.mask = self.mask
+        b.player_stones = self.player_stones[:]
+        b.window_codes = None
+        b.eval_scores = None
+        if self.window_codes is not None:
+            b.window_codes = self.window_codes[:]
+            b.eval_scores = self.eval_scores[:]
+        return b
+
+    def enable_eval_tracking(self):
+        """Keep score_position up to date on every drop/undo so reading it
+        is O(1) instead of a scan over all windows."""
+        self.window_codes, self.eval_scores = init_eval_tracking(self)
+
+    def reset(self):
+        self.__init__()
+
+    @property
+    def grid(self) -> GridView:
+        return GridView(self.cells)
+
+    @property
+    def canonical_key(self) -> int:
+        """Same for a position and its mirror image (see is_mirrored)."""
+        return min(self.key, self.mirror_key)
+
+    def is_mirrored(self) -> bool:
+        """True if canonical_key is the mirror's key, so columns stored under
+        it must be flipped (COLS - 1 - col) to apply to this board."""
+        return self.mirror_key < self.key
+
+    def is_symmetric(self) -> bool:
+        return self.key == self.mirror_key
+
+    def stones(self, player: int) -> int:
+        """Bitmask of the cells owned by `player`."""
+        return self.player_stones[player]
+
+    def possible_mask(self) -> int:
+        """Bitmask of the cells a piece can be dropped into now."""
+        return (self.mask + BOTTOM_MASK) & BOARD_MASK
+
+    def winning_moves(self, player: int) -> int:
+        """Bitmask of the playable cells where `player` completes a four."""
+        return winning_cells(self.stones(player), self.mask) & self.possible_mask()
+
+    def unsafe_moves(self, player: int) -> int:
+        """Bitmask of the playable cells right below a cell where the
+        opponent of `player` would complete a four; playing there lets
+        them win on the next move."""
+        opp = PLAYER1 if player == PLAYER2 else PLAYER2
+        return self.possible_mask() & (winning_cells(self.stones(opp), self.mask) >> 1)
+
+    def valid_moves(self):
+        cells = self.cells
+        return [c for c in range(COLS) if not cells[c]]
+
+    def height(self, col: int) -> int:
+        """Number of pieces in `col`."""
+        return self.heights[col]
+
+    def drop_piece(self, col, player):
+        if col < 0 or col >= COLS or self.cells[col]:
+            return False
+        r = ROWS - 1 - self.heights[col]
+        self.cells[r * COLS + col] = player
+        self.heights[col] += 1
+        self.key ^= ZOBRIST[player][r][col]
+        self.mirror_key ^= ZOBRIST[player][r][COLS - 1 - col]
+        bit = cell_bit(r, col)
+        self.mask |= bit
+        self.player_stones[player] |= bit
+        if self.window_codes is not None:
+            update_eval(self.window_codes, self.eval_scores, r, col, player, 1)
+        self.last_move = CELL_COORDS[r * COLS + col]
+        self.moves.append(self.last_move)
+        return True
+
+    def undo_move(self, col):
+        """Take back the last move, which must have been played in `col`."""
+        if not self.moves or self.moves[-1][1] != col:
+            return False
+        r, _ = self.moves.pop()
+        player = self.cells[r * COLS + col]
+        self.key ^= ZOBRIST[player][r][col]
+        self.mirror_key ^= ZOBRIST[player][r][COLS - 1 - col]
+        bit = cell_bit(r, col)
+        self.mask ^= bit
+        self.player_stones[player] ^= bit
+        if self.window_codes is not None:
+            update_eval(self.window_codes, self.eval_scores, r, col, player, -1)
+        self.cells[r * COLS + col] = EMPTY
+        self.heights[col] -= 1
+        self.last_move = self.moves[-1] if self.moves else None
+        return True
+
+    def is_full(self):
+        return self.mask == BOARD_MASK
+
+    def is_winning_move(self, col: int, player: int) -> bool:
+        """True if dropping `player` in `col` would complete a four."""
+        if col < 0 or col >= COLS or self.cells[col]:
+            return False
+        return has_four(self.player_stones[player] | cell_bit(ROWS - 1 - self.heights[col], col))
+
+    def last_move_wins(self) -> bool:
+        """True if the piece at last_move is part of a four."""
+        if self.last_move is None:
+            return False
+        r, c = self.last_move
+        return has_four(self.player_stones[self.cells[r * COLS + c]])
+
+    def check_winner(self) -> Optional[int]:
+        """Return winner id or None."""
+        for player in (PLAYER1, PLAYER2):
+            if has_four(self.player_stones[player]):
+                return player
+        return None
+
+    def winning_positions(self) -> Optional[List[Tuple[int,int]]]:
+        """Return list of 4 coords if there's a winning four, else None."""
+        p1 = self.player_stones[PLAYER1]
+        p2 = self.player_stones[PLAYER2]
+        for coords, wmask in zip(WINDOWS, WINDOW_MASKS):
+            if p1 & wmask == wmask or p2 & wmask == wmask:
+                return list(coords)
+        return None
+
+    # Heuristic helpers
+    def evaluate_window(self, window: List[int], player: int) -> int:
+        score = 0
+        opp = PLAYER1 if player == PLAYER2 else PLAYER2
+        if window.count(player) == 4:
+            score += 100
+        elif window.count(player) == 3 and window.count(EMPTY) == 1:
+            score += 5
+        elif window.count(player) == 2 and window.count(EMPTY) == 2:
+            score += 2
+        if window.count(opp) == 3 and window.count(EMPTY) == 1:
+            score -= 4
+        return score
+
+    def score_position(self, player: int) -> int:
+        if self.eval_scores is not None:
+            return self.eval_scores[player]
+        # same result as running evaluate_window over all 69 windows, but each
+        # window is a single table lookup on its base-3 code
+        cells = self.cells
+        table = WINDOW_SCORES[player]
+        # center column control
+        score = (self.player_stones[player] & CENTER_MASK).bit_count() * 3
+        for a, b, c, d in WINDOW_CELLS:
+            score += table[cells[a] * 27 + cells[b] * 9 + cells[c] * 3 + cells[d]]
+        return score
+
+def _build_window_scores() -> List[List[int]]:
+    """evaluate_window for every possible window, per player, indexed by the
+    base-3 code c0*27 + c1*9 + c2*3 + c3 of its cells (EMPTY/PLAYER1/PLAYER2
+    are the digits 0/1/2)."""
+    scores = [[0] * 81 for _ in range(3)]
+    for code in range(81):
+        window = [code // 27, code // 9 % 3, code // 3 % 3, code % 3]
+        for player in (PLAYER1, PLAYER2):
+            scores[player][code] = Board.evaluate_window(None, window, player)
+    return scores
+
+WINDOW_SCORES = _build_window_scores()
+
+def init_eval_tracking(board) -> Tuple[List[int], List[int]]:
+    """Window codes and per-player scores for `board`, the state that
+    update_eval keeps current."""
+    cells = [v for row in board.grid for v in row]
+    codes = [cells[a] * 27 + cells[b] * 9 + cells[c] * 3 + cells[d] for a, b, c, d in WINDOW_CELLS]
+    scores = [0] * 3
+    for player in (PLAYER1, PLAYER2):
+        scores[player] = board.score_position(player)
+    return codes, scores
+
+def update_eval(codes: List[int], scores: List[int], r: int, c: int, player: int, sign: int):
+    """Add (sign=1) or remove (sign=-1) `player`'s piece at (r, c), updating
+    only the windows through that cell."""
+    t1 = WINDOW_SCORES[PLAYER1]
+    t2 = WINDOW_SCORES[PLAYER2]
+    s1 = scores[PLAYER1]
+    s2 = scores[PLAYER2]
+    for w, weight in CELL_WINDOWS[r * COLS + c]:
+        old = codes[w]
+        new = old + sign * player * weight
+        codes[w] = new
+        s1 += t1[new] - t1[old]
+        s2 += t2[new] - t2[old]
+    if c == COLS // 2:
+        if player == PLAYER1:
+            s1 += 3 * sign
+        else:
+            s2 += 3 * sign
+    scores[PLAYER1] = s1
+    scores[PLAYER2] = s2
+
+# ============================
+# BITBOARD
+# ============================
+# Bit layout: each column uses ROWS + 1 bits (one spare sentinel bit on top),
+# bit index = col * (ROWS + 1) + height, where height 0 is the bottom row.
+#
+#   .  .  .  .  .  .  .
+#   5 12 19 26 33 40 47
+#   4 11 18 25 32 39 46
+#   3 10 17 24 31 38 45
+#   2  9 16 23 30 37 44
+#   1  8 15 22 29 36 43
+#   0  7 14 21 28 35 42
+BIT_H = ROWS + 1
+BOTTOM_MASK = sum(1 << (c * BIT_H) for c in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+def cell_bit(r: int, c: int) -> int:
+    """Bit for grid cell (r, c), r counted from the top like Board.grid."""
+    return 1 << (c * BIT_H + (ROWS - 1 - r))
+
+def column_mask(col: int) -> int:
+    return ((1 << ROWS) - 1) << (col * BIT_H)
+
+def top_mask(col: int) -> int:
+    return 1 << (ROWS - 1 + col * BIT_H)
+
+def bottom_mask(col: int) -> int:
+    return 1 << (col * BIT_H)
+
+COLUMN_MASKS = [column_mask(c) for c in range(COLS)]
+
+def winning_cells(stones: int, mask: int) -> int:
+    """Empty cells (playable now or later) that would complete a four for
+    `stones`."""
+    # vertical: three stacked stones and the cell above them
+    r = (stones << 1) & (stones << 2) & (stones << 3)
+    # horizontal, diagonal \ and diagonal /, unrolled (hot in the solver)
+    p = (stones << 7) & (stones << 14)
+    r |= p & ((stones << 21) | (stones >> 7))
+    p = (stones >> 7) & (stones >> 14)
+    r |= p & ((stones << 7) | (stones >> 21))
+    p = (stones << 6) & (stones << 12)
+    r |= p & ((stones << 18) | (stones >> 6))
+    p = (stones >> 6) & (stones >> 12)
+    r |= p & ((stones << 6) | (stones >> 18))
+    p = (stones << 8) & (stones << 16)
+    r |= p & ((stones << 24) | (stones >> 8))
+    p = (stones >> 8) & (stones >> 16)
+    r |= p & ((stones << 8) | (stones >> 24))
+    return r & (BOARD_MASK ^ mask)
+
+def bit_columns(bits: int) -> List[int]:
+    """Columns that contain any of `bits`, left to right."""
+    return [c for c, cmask in enumerate(COLUMN_MASKS) if bits & cmask]
+
+def mirror_bits(bits: int) -> int:
+    """Left-right mirror of a bitboard. Also mirrors a stones + mask key,
+    since the sum never carries from one column into the next."""
+    column = (1 << BIT_H) - 1
+    m = 0
+    for c in range(COLS):
+        m |= ((bits >> (c * BIT_H)) & column) << ((COLS - 1 - c) * BIT_H)
+    return m
+
+def has_four(stones: int) -> bool:
+    """True if the bitmask contains four aligned stones."""
+    # horizontal, diagonal /, diagonal \, vertical
+    for shift in (BIT_H, BIT_H + 1, BIT_H - 1, 1):
+        m = stones & (stones >> shift)
+        if m & (m >> (2 * shift)):
+            return True
+    return False
+
+WINDOW_MASKS = [sum(cell_bit(r, c) for r, c in w) for w in WINDOWS]
+CENTER_MASK = column_mask(COLS // 2)
+
+class BitGridView:
+    """Read-only ``grid[r][c]`` view over a BitBoard, built on access."""
+    __slots__ = ("_board",)
+
+    def __init__(self, board: "BitBoard"):
+        self._board = board
+
+    def __len__(self):
+        return ROWS
+
+    def __getitem__(self, r: int) -> List[int]:
+        if r < 0:
+            r += ROWS
+        if r < 0 or r >= ROWS:
+            raise IndexError("grid row out of range")
+        p1 = self._board.stones(PLAYER1)
+        p2 = self._board.stones(PLAYER2)
+        row = []
+        for c in range(COLS):
+            bit = cell_bit(r, c)
+            row.append(PLAYER1 if p1 & bit else PLAYER2 if p2 & bit else EMPTY)
+        return row
+
+    def __iter__(self):
+        return (self[r] for r in range(ROWS))
+
+# (row, col, switched_sides) move records for BitBoard.moves, shared like
+# CELL_COORDS; index 2 * (r * COLS + c) + switched
+MOVE_RECORDS = [(r, c, switched) for r, c in CELL_COORDS for switched in (False, True)]
+
+class BitBoard:
+    """Drop-in replacement for Board backed by two integers.
+
+    ``position`` holds the stones of the player to move (``current``) and
+    ``mask`` holds every occupied cell, using the 7-bit-per-column layout above.
+    """
+    __slots__ = ("position", "mask", "current", "mirror_p1", "mirror_mask",
+                 "last_move", "moves", "window_codes", "eval_scores")
+
+    def __init__(self):
+        self.position = 0
+        self.mask = 0
+        self.current = PLAYER1
+        # player 1's stones and the mask of the mirrored board, for mirror_key
+        self.mirror_p1 = 0
+        self.mirror_mask = 0
+        self.last_move: Optional[Tuple[int, int]] = None
+        # (row, col, switched_sides) per move, used by undo_move
+        self.moves: List[Tuple[int, int, bool]] = []
+        self.window_codes: Optional[List[int]] = None
+        self.eval_scores: Optional[List[int]] = None
+
+    def copy(self):
+        b = BitBoard.__new__(BitBoard)
+        b.position = self.position
+        b.mask = self.mask
+        b.current = self.current
+        b.mirror_p1 = self.mirror_p1
+        b.mirror_mask = self.mirror_mask
+        b.last_move = self.last_move
+        b.moves = self.moves[:]
+        b.window_codes = None
+        b.eval_scores = None
+        if self.window_codes is not None:
+            b.window_codes = self.window_codes[:]
+            b.eval_scores = self.eval_scores[:]
+        return b
+
+    def enable_eval_tracking(self):
+        """Keep score_position up to date on every drop/undo (see Board)."""
+        self.window_codes, self.eval_scores = init_eval_tracking(self)
+
+    def reset(self):
+        self.__init__()
+
+    @property
+    def grid(self) -> BitGridView:
+        return BitGridView(self)
+
+    @property
+    def key(self) -> int:
+        """Unique position key: player 1's stones plus the occupied mask."""
+        return self.stones(PLAYER1) + self.mask
+
+    @property
+    def mirror_key(self) -> int:
+        return self.mirror_p1 + self.mirror_mask
+
+    canonical_key = Board.canonical_key
+    is_mirrored = Board.is_mirrored
+    is_symmetric = Board.is_symmetric
+    possible_mask = Board.possible_mask
+    winning_moves = Board.winning_moves
+    unsafe_moves = Board.unsafe_moves
+
+    def stones(self, player: int) -> int:
+        """Bitmask of the cells owned by `player`."""
+        if player == self.current:
+            return self.position
+        return self.position ^ self.mask
+
+    def can_play(self, col: int) -> bool:
+        return 0 <= col < COLS and not self.mask & top_mask(col)
+
+    def valid_moves(self):
+        return [c for c in range(COLS) if not self.mask & top_mask(c)]
+
+    def height(self, col: int) -> int:
+        """Number of pieces in `col`."""
+        return (self.mask & column_mask(col)).bit_count()
+
+    def drop_piece(self, col, player):
+        if not self.can_play(col):
+            return False
+        height = (self.mask & column_mask(col)).bit_count()
+        bit = (self.mask + bottom_mask(col)) & column_mask(col)
+        switched = player == self.current
+        if switched:
+            # the opponent's stones become the side-to-move's stones
+            self.position ^= self.mask
+            self.current = PLAYER1 if player == PLAYER2 else PLAYER2
+        self.mask |= bit
+        mirror_bit = cell_bit(ROWS - 1 - height, COLS - 1 - col)
+        self.mirror_mask |= mirror_bit
+        if player == PLAYER1:
+            self.mirror_p1 |= mirror_bit
+        cell = (ROWS - 1 - height) * COLS + col
+        self.last_move = CELL_COORDS[cell]
+        self.moves.append(MOVE_RECORDS[2 * cell + switched])
+        if self.window_codes is not None:
+            update_eval(self.window_codes, self.eval_scores, ROWS - 1 - height, col, player, 1)
+        return True
+
+    def undo_move(self, col):
+        """Take back the last move, which must have been played in `col`."""
+        if not self.moves or self.moves[-1][1] != col:
+            return False
+        r, _, switched = self.moves.pop()
+        if self.window_codes is not None:
+            player = PLAYER1 if self.stones(PLAYER1) & cell_bit(r, col) else PLAYER2
+            update_eval(self.window_codes, self.eval_scores, r, col, player, -1)
+        self.mask ^= cell_bit(r, col)
+        mirror_bit = cell_bit(r, COLS - 1 - col)
+        self.mirror_mask ^= mirror_bit
+        self.mirror_p1 &= ~mirror_bit
+        if switched:
+            self.position ^= self.mask
+            self.current = PLAYER1 if self.current == PLAYER2 else PLAYER2
+        self.last_move = None
+        if self.moves:
+            r, c, _ = self.moves[-1]
+            self.last_move = CELL_COORDS[r * COLS + c]
+        return True
+
+    def is_full(self):
+        return self.mask == BOARD_MASK
+
+    def is_winning_move(self, col: int, player: int) -> bool:
+        """True if dropping `player` in `col` would complete a four."""
+        if not self.can_play(col):
+            return False
+        bit = (self.mask + bottom_mask(col)) & column_mask(col)
+        return has_four(self.stones(player) | bit)
+
+    def last_move_wins(self) -> bool:
+        """True if the piece at last_move is part of a four."""
+        if self.last_move is None:
+            return False
+        r, c = self.last_move
+        p1 = self.stones(PLAYER1)
+        return has_four(p1 if p1 & cell_bit(r, c) else p1 ^ self.mask)
+
+    def check_winner(self) -> Optional[int]:
+        """Return winner id or None."""
+        for player in (PLAYER1, PLAYER2):
+            if has_four(self.stones(player)):
+                return player
+        return None
+
+    def winning_positions(self) -> Optional[List[Tuple[int, int]]]:
+        """Return list of 4 coords if there's a winning four, else None."""
+        p1 = self.stones(PLAYER1)
+        p2 = self.stones(PLAYER2)
+        for coords, wmask in zip(WINDOWS, WINDOW_MASKS):
+            if p1 & wmask == wmask or p2 & wmask == wmask:
+                return list(coords)
+        return None
+
+    # Heuristic helpers (same scores as Board)
+    def evaluate_window(self, window: List[int], player: int) -> int:
+        return Board.evaluate_window(self, window, player)
+
+    def score_position(self, player: int) -> int:
+        if self.eval_scores is not None:
+            return self.eval_scores[player]
+        own = self.stones(player)
+        opp = self.position ^ self.mask if player == self.current else self.position
+        score = (own & CENTER_MASK).bit_count() * 3
+        for wmask in WINDOW_MASKS:
+            mine = (own & wmask).bit_count()
+            theirs = (opp & wmask).bit_count()
+            if theirs == 0:
+                if mine == 4:
+                    score += 100
+                elif mine == 3:
+                    score += 5
+                elif mine == 2:
+                    score += 2
+            elif theirs == 3 and mine == 0:
+                score -= 4
+        return score
+
+def board_from_moves(moves: str, board_cls=Board):
+    """Build a board from a string of column digits, players alternating
+    from PLAYER1 (e.g. "3342")."""
+    board = board_cls()
+    player = PLAYER1
+    for ch in moves:
+        if not board.drop_piece(int(ch), player):
+            raise ValueError(f"illegal move {ch!r} in {moves!r}")
+        player = PLAYER1 if player == PLAYER2 else PLAYER2
+    return board
+
+BOARD_CLASSES = {"board": Board, "bitboard": BitBoard}
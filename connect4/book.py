@@ -0,0 +1,78 @@
+"""Offline generation of the opening book (`book` subcommand)."""
+
+import argparse
+import time
+from typing import List, Tuple, Optional
+
+from .board import Board, COLS, PLAYER1, PLAYER2
+from .errors import SearchTimeout
+from .records import (BOOK_HEADER, BOOK_PATH, BOOK_RECORD, BOOK_SOLVED, position_key,
+                      write_opening_book)
+from .search import Minimax
+from .solver import Solver
+
+# ============================
+# OPENING BOOK GENERATION
+# ============================
+def build_opening_book(plies: int = 8, depth: int = 10, solve_ms: float = 0,
+                       verbose: bool = True) -> dict:
+    """Search every position a book side can face in its first `plies`
+    plies, for each side in turn: the book side follows its book move, the
+    opponent tries every move. Each position gets `solve_ms` of Solver time
+    first and falls back to a `depth` PVS search."""
+    entries = {}
+    searcher = Minimax(algorithm="pvs")
+    solver = Solver() if solve_ms > 0 else None
+    start = time.perf_counter()
+    for book_player in (PLAYER1, PLAYER2):
+        frontier = [Board()]
+        for ply in range(plies):
+            player = PLAYER1 if ply % 2 == 0 else PLAYER2
+            next_frontier = {}
+            for board in frontier:
+                if player == book_player:
+                    key, flipped = position_key(board)
+                    if key not in entries:
+                        move, *rest = _book_entry(board, player, depth, searcher, solver, solve_ms)
+                        # stored for the canonical orientation
+                        entries[key] = (COLS - 1 - move if flipped else move, *rest)
+                    move = entries[key][0]
+                    cols = [COLS - 1 - move if flipped else move]
+                else:
+                    cols = board.valid_moves()
+                for col in cols:
+                    child = board.copy()
+                    child.drop_piece(col, player)
+                    # mirror images are searched once
+                    if not (child.check_winner() or child.is_full()):
+                        next_frontier.setdefault(position_key(child)[0], child)
+            frontier = list(next_frontier.values())
+            if verbose:
+                print(f"P{book_player} ply {ply}: {len(entries)} entries "
+                      f"({time.perf_counter() - start:.0f}s)")
+    return entries
+
+def _book_entry(board, player: int, depth: int, searcher: Minimax, solver: Optional[Solver],
+                solve_ms: float) -> Tuple[int, int, int]:
+    if solver is not None:
+        try:
+            move, score = solver.best_move(board, solve_ms)
+            return move, BOOK_SOLVED, score
+        except SearchTimeout:
+            pass
+    searcher.reset_move_ordering()
+    move = searcher.best_move(board, depth, player)
+    return move, min(depth, BOOK_SOLVED - 1), searcher.last_score
+
+def book_main(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="book", description="Generate the opening book offline")
+    parser.add_argument("--plies", type=int, default=8, help="cover positions with fewer stones than this")
+    parser.add_argument("--depth", type=int, default=10)
+    parser.add_argument("--solve-ms", type=float, default=0,
+                        help="try the exact Solver first for this long per position")
+    parser.add_argument("--out", default=BOOK_PATH)
+    args = parser.parse_args(argv)
+    entries = build_opening_book(args.plies, args.depth, args.solve_ms)
+    write_opening_book(args.out, entries, args.plies)
+    print(f"{len(entries)} positions -> {args.out} "
+          f"({BOOK_HEADER.size + len(entries) * BOOK_RECORD.size:,} bytes)")
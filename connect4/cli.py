@@ -0,0 +1,38 @@
+"""Command-line entry point: dispatches the headless subcommands or starts the GUI."""
+
+import sys
+from typing import List, Optional
+
+# ============================
+# Run App
+# ============================
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    # headless entry points: `python "connect4 full code project.py" selfplay ...`
+    # Each subcommand imports only what it needs; tkinter is imported for
+    # the GUI alone.
+    if argv and argv[0] == "selfplay":
+        from .selfplay import selfplay_main
+        selfplay_main(argv[1:])
+        return
+    if argv and argv[0] == "bench":
+        from .bench import bench_main
+        sys.exit(bench_main(argv[1:]))
+    if argv and argv[0] == "book":
+        from .book import book_main
+        book_main(argv[1:])
+        return
+    if argv and argv[0] == "endgame":
+        from .endgame import endgame_main
+        endgame_main(argv[1:])
+        return
+    if argv and argv[0] == "serve":
+        from .server import serve_main
+        serve_main(argv[1:])
+        return
+    if argv and argv[0] == "loadgen":
+        from .server import loadgen_main
+        sys.exit(loadgen_main(argv[1:]))
+    from .gui import App
+    app = App()
+    app.mainloop()
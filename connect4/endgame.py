@@ -0,0 +1,71 @@
+"""Offline generation of the endgame table (`endgame` subcommand)."""
+
+import argparse
+import random
+import time
+from typing import List
+
+from .board import Board, PLAYER1, PLAYER2
+from .records import BOOK_HEADER, ENDGAME_PATH, ENDGAME_RECORD, EndgameTable, position_key
+from .search import ENDGAME_EMPTY, Minimax
+from .solver import BOARD_SIZE, Solver, board_masks
+from .tt import TranspositionTable
+
+# ============================
+# ENDGAME TABLE GENERATION
+# ============================
+def build_endgame_table(games: int = 1000, max_empty: int = ENDGAME_EMPTY, depth: int = 4,
+                        seed: int = 0, verbose: bool = True) -> dict:
+    """Solve the positions with at most `max_empty` empty cells that come up
+    in `games` self-play games (random openings, then `depth` searches), plus
+    every position one move away from them."""
+    rng = random.Random(seed)
+    # the table being built must not answer for itself
+    searcher = Minimax(algorithm="pvs", endgame_empty=0)
+    solver = Solver(TranspositionTable(1_000_000, replace="always"))
+    entries = {}
+    start = time.perf_counter()
+
+    def add(board):
+        if board.check_winner() or board.is_full():
+            return
+        position, mask, stones = board_masks(board)
+        key, _ = position_key(board)
+        if BOARD_SIZE - stones <= max_empty and key not in entries:
+            entries[key] = (solver.solve_masks(position, mask, stones),)
+
+    for game in range(games):
+        board = Board()
+        player = PLAYER1
+        random_plies = rng.randint(2, 8)
+        while not (board.check_winner() or board.is_full()):
+            if len(board.moves) < random_plies:
+                col = rng.choice(board.valid_moves())
+            else:
+                searcher.reset_move_ordering()
+                col = searcher.best_move(board, depth, player)
+            board.drop_piece(col, player)
+            player = PLAYER1 if player == PLAYER2 else PLAYER2
+            add(board)
+            if BOARD_SIZE - len(board.moves) <= max_empty:
+                for reply in board.valid_moves():
+                    child = board.copy()
+                    child.drop_piece(reply, player)
+                    add(child)
+        if verbose and (game + 1) % 10 == 0:
+            print(f"{game + 1} games: {len(entries)} positions ({time.perf_counter() - start:.0f}s)")
+    return entries
+
+def endgame_main(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="endgame", description="Generate the endgame table offline")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--empty", type=int, default=ENDGAME_EMPTY,
+                        help="store positions with at most this many empty cells")
+    parser.add_argument("--depth", type=int, default=4, help="search depth of the self-play games")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=ENDGAME_PATH)
+    args = parser.parse_args(argv)
+    entries = build_endgame_table(args.games, args.empty, args.depth, args.seed)
+    EndgameTable.write(args.out, entries, args.empty)
+    print(f"{len(entries)} positions -> {args.out} "
+          f"({BOOK_HEADER.size + len(entries) * ENDGAME_RECORD.size:,} bytes)")
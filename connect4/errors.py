@@ -0,0 +1,7 @@
+"""Exceptions raised when a search runs out of time or is cancelled."""
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+class SearchCancelled(SearchTimeout):
+    """Raised out of best_move when its cancel_event is set."""
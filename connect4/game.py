@@ -0,0 +1,162 @@
+"""Players and the GameEngine that runs a game between them."""
+
+import threading
+from typing import Tuple, Optional
+
+from .board import Board, COLS, PLAYER1, PLAYER2, ROWS
+from .errors import SearchCancelled, SearchTimeout
+from .records import BOOK_SOLVED, OpeningBook
+from .search import Minimax
+from .solver import SOLVER_BUDGET_MS, SOLVER_COLUMN_ORDER, Solver
+
+# ============================
+# PLAYERS
+# ============================
+class HumanPlayer:
+    __slots__ = ("pid",)
+
+    def __init__(self, pid: int):
+        self.pid = pid
+
+    def choose_move(self, board: Board) -> int:
+        # Console fallback (used in Console mode)
+        while True:
+            try:
+                col = int(input(f"Player {self.pid} turn. Choose a column {board.valid_moves()}: "))
+                if col in board.valid_moves():
+                    return col
+                print("Invalid column, try again.")
+            except ValueError:
+                print("Please enter an integer column.")
+
+class AIPlayer:
+    __slots__ = ("pid", "depth", "time_budget_ms", "verbose", "ai", "solver", "book",
+                 "last_solution", "from_book", "pondered", "from_ponder")
+
+    def __init__(self, pid: int, depth: int = 4, time_budget_ms: Optional[float] = None,
+                 workers: int = 1, verbose: bool = True, perfect: bool = False,
+                 book=None, **search_options):
+        # with time_budget_ms the search deepens until the budget is spent
+        # and `depth` is ignored; workers > 1 searches root moves in parallel;
+        # search_options are passed on to Minimax, e.g. algorithm="pvs" or
+        # use_tt=False
+        # perfect=True asks the Solver first and only falls back to Minimax
+        # when the position cannot be solved within the budget
+        # book: an OpeningBook (or a path to one) consulted before any search
+        self.pid = pid
+        self.depth = depth
+        self.time_budget_ms = time_budget_ms
+        self.verbose = verbose
+        self.ai = Minimax(workers=workers, **search_options)
+        self.solver = Solver() if perfect else None
+        self.book = OpeningBook(book) if isinstance(book, str) else book
+        # (exact score, stones on the board) of the last solved move, if any
+        self.last_solution: Optional[Tuple[int, int]] = None
+        self.from_book = False
+        # position key -> (move, last_solution, from_book, stats) found by
+        # ponder for each reply the opponent might play
+        self.pondered: dict = {}
+        self.from_ponder = False
+
+    @property
+    def nodes(self) -> int:
+        return self.ai.nodes + (self.solver.nodes if self.solver is not None else 0)
+
+    def choose_move(self, board: Board, cancel_event: Optional[threading.Event] = None) -> int:
+        # CPU-bound; the GUI runs this on a worker thread (see GameFrame.ai_move)
+        entry = self.pondered.pop(board.key, None)
+        if entry is not None:
+            col, self.last_solution, self.from_book, self.ai.stats = entry
+            self.from_ponder = True
+            self.ai.nodes = 0
+            return col
+        self.from_ponder = False
+        return self._search(board, cancel_event, self.verbose)
+
+    def ponder(self, board: Board, cancel_event: threading.Event):
+        """Search on the opponent's time: for each move the opponent can
+        play on `board`, find our reply and keep it for choose_move. Stops
+        quietly once cancel_event is set; whatever was not pondered is
+        searched normally, with the transposition table already warm."""
+        self.pondered = {}
+        opp = PLAYER1 if self.pid == PLAYER2 else PLAYER2
+        for col in SOLVER_COLUMN_ORDER:
+            if cancel_event.is_set():
+                return
+            child = board.copy()
+            if not child.drop_piece(col, opp) or child.last_move_wins() or child.is_full():
+                continue
+            try:
+                reply = self._search(child, cancel_event, False)
+            except SearchCancelled:
+                return
+            self.pondered[child.key] = (reply, self.last_solution, self.from_book, self.ai.stats)
+
+    def _search(self, board: Board, cancel_event: Optional[threading.Event], verbose: bool) -> int:
+        self.last_solution = None
+        self.from_book = False
+        if self.book is not None:
+            entry = self.book.probe(board)
+            if entry is not None:
+                col, depth, score = entry
+                self.from_book = True
+                if depth == BOOK_SOLVED:
+                    self.last_solution = (score, len(board.moves))
+                self.ai.stats = None
+                self.ai.nodes = 0
+                return col
+        budget = self.time_budget_ms
+        if self.solver is not None:
+            self.ai.nodes = 0
+            # with a time budget the solver gets half and the fallback the rest
+            if budget is not None:
+                budget /= 2
+            try:
+                col, score = self.solver.best_move(
+                    board, SOLVER_BUDGET_MS if budget is None else budget, cancel_event)
+            except SearchCancelled:
+                raise
+            except SearchTimeout:
+                if verbose:
+                    print(f"AI (P{self.pid}) could not solve the position in time, searching...")
+            else:
+                self.last_solution = (score, len(board.moves))
+                self.ai.stats = None
+                return col
+        if budget is None:
+            if verbose:
+                print(f"AI (P{self.pid}) thinking (depth={self.depth})...")
+            return self.ai.best_move(board, self.depth, self.pid, cancel_event=cancel_event)
+        if verbose:
+            print(f"AI (P{self.pid}) thinking (budget={budget:g} ms)...")
+        return self.ai.best_move(board, ROWS * COLS, self.pid, budget, cancel_event)
+
+# ============================
+# GAME ENGINE
+# ============================
+class GameEngine:
+    __slots__ = ("board", "p1", "p2", "current")
+
+    def __init__(self, p1, p2, board_cls=Board):
+        # board_cls: Board or BitBoard (same public API)
+        self.board = board_cls()
+        self.p1 = p1
+        self.p2 = p2
+        self.current = p1
+
+    def switch(self):
+        self.current = self.p1 if self.current is self.p2 else self.p2
+
+    def make_move(self, col: int) -> Optional[int]:
+        if col not in self.board.valid_moves():
+            return None
+        self.board.drop_piece(col, self.current.pid)
+        winner = self.board.check_winner()
+        if winner or self.board.is_full():
+            return winner
+        self.switch()
+        return None
+
+    def reset(self):
+        self.board.reset()
+        self.current = self.p1
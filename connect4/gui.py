@@ -0,0 +1,509 @@
+"""Tk GUI and console mode. The only module that imports tkinter."""
+
+import tkinter as tk
+from tkinter import messagebox
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional
+
+from .board import Board, COLS, EMPTY, PLAYER1, PLAYER2, ROWS
+from .errors import SearchCancelled
+from .game import AIPlayer, GameEngine, HumanPlayer
+from .records import load_opening_book
+from .search import AI_POLL_MS
+from .solver import describe_solver_score
+
+# ============================
+# GUI CONSTANTS
+# ============================
+CELL_SIZE = 80
+HIGHLIGHT_COLOR = "green"
+P1_COLOR = "red"
+P2_COLOR = "yellow"
+EMPTY_COLOR = "white"
+
+# ============================
+# Console board printing (Style 3 with row separators)
+# ============================
+def print_console_board(board: Board):
+    # Top border
+    print("+---" * COLS + "+")
+    for r in range(ROWS):
+        row_str = "|"
+        for c in range(COLS):
+            cell = board.grid[r][c]
+            symbol = "."
+            if cell == PLAYER1:
+                symbol = "X"
+            elif cell == PLAYER2:
+                symbol = "O"
+            row_str += f" {symbol} |"
+        print(row_str)
+        # Row separator
+        print("+---" * COLS + "+")
+    # Column numbers
+    print("  " + "   ".join(str(c) for c in range(COLS)))
+
+# ============================
+# Run Console Mode (withdraw GUI, play, then restore)
+# ============================
+def run_console_mode(root: tk.Tk, app, mode: int, difficulty_depth: Optional[int],
+                     perfect: bool = False):
+    """
+    mode: 1 PvP, 2 PvAI, 3 AIvAI
+    difficulty_depth: used for AI depth
+    perfect: PvAI only, the AI plays solved moves when it can
+    root: main Tk root (will be withdrawn and deiconified)
+    app: instance of App (to show LauncherFrame after finish)
+    """
+    # hide GUI
+    root.withdraw()
+    try:
+        # prepare players
+        if mode == 1:
+            p1 = HumanPlayer(1)
+            p2 = HumanPlayer(2)
+        elif mode == 2:
+            p1 = HumanPlayer(1)
+            depth = difficulty_depth if difficulty_depth is not None else 4
+            # the book plays at least Hard strength, so easier levels skip it
+            book = app.book if depth >= 6 else None
+            p2 = AIPlayer(2, depth=depth, perfect=perfect, book=book, collect_stats=True)
+        else:
+            depth = difficulty_depth if difficulty_depth is not None else 4
+            p1 = AIPlayer(1, depth=depth, collect_stats=True)
+            p2 = AIPlayer(2, depth=depth, collect_stats=True)
+
+        engine = GameEngine(p1, p2)
+
+        print("\n=== Connect 4 — Console Mode ===\n")
+        print("Board legend: X = Player1, O = Player2\n")
+        print_console_board(engine.board)
+
+        # main console loop
+        while True:
+            current = engine.current
+            if isinstance(current, HumanPlayer):
+                move = current.choose_move(engine.board)
+                result_info = f"Turn played by Player {current.pid}"
+            else:
+                move = current.choose_move(engine.board)
+                result_info = f"Turn played by AI Player {current.pid}"
+                if current.last_solution is not None:
+                    result_info += f" (solved: {describe_solver_score(*current.last_solution)})"
+                elif current.from_book:
+                    result_info += " (opening book)"
+                elif current.ai.stats is not None:
+                    result_info += f" ({current.ai.stats.summary()})"
+            winner = engine.make_move(move)
+
+            # print board and turn info
+            print()
+            print(result_info)
+            print_console_board(engine.board)
+
+            if winner:
+                print(f"\nGame Over — Player {winner} wins!")
+                break
+            if engine.board.is_full():
+                print("\nGame Over — Draw!")
+                break
+
+        input("\nPress Enter to return to GUI...")
+    finally:
+        # restore GUI and show launcher frame
+        root.deiconify()
+        app.show_frame("LauncherFrame")
+
+# ============================
+# GUI with Frame Switching
+# ============================
+class App(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("Connect 4")
+        self.resizable(False, False)
+        self.geometry(f"{COLS*CELL_SIZE}x{ROWS*CELL_SIZE + 120}")  # leave room for controls
+        # shared state
+        self.mode = 2  # default PvAI
+        self.difficulty_depth = 4
+        self.perfect = False
+        self.engine: Optional[GameEngine] = None
+        # memory-mapped, so this costs nothing until a lookup
+        self.book = load_opening_book()
+
+        # frames, each built the first time it is shown (see show_frame)
+        self.frames = {}
+
+        self.show_frame("LauncherFrame")
+
+    def show_frame(self, name: str):
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = self.frames[name] = FRAME_CLASSES[name](parent=self, controller=self)
+            frame.place(x=0, y=0, relwidth=1, relheight=1)
+        frame.tkraise()
+
+    def prepare_engine(self):
+        # create players based on mode and difficulty
+        if self.mode == 1:  # PvP
+            p1 = HumanPlayer(1)
+            p2 = HumanPlayer(2)
+        elif self.mode == 2:  # PvAI
+            p1 = HumanPlayer(1)
+            # the book plays at least Hard strength, so easier levels skip it
+            book = self.book if self.difficulty_depth >= 6 else None
+            p2 = AIPlayer(2, depth=self.difficulty_depth, perfect=self.perfect, book=book,
+                          collect_stats=True)
+        else:  # AIvAI
+            p1 = AIPlayer(1, depth=self.difficulty_depth, collect_stats=True)
+            p2 = AIPlayer(2, depth=self.difficulty_depth, collect_stats=True)
+        self.engine = GameEngine(p1, p2)
+
+# Launcher Frame
+class LauncherFrame(tk.Frame):
+    def __init__(self, parent, controller: App):
+        super().__init__(parent)
+        self.controller = controller
+        tk.Label(self, text="Connect 4", font=("Arial", 20)).pack(pady=12)
+        tk.Label(self, text="Choose Interface:", font=("Arial", 12)).pack(pady=6)
+
+        btn_gui = tk.Button(self, text="Start (GUI)", width=20, command=lambda: controller.show_frame("ModeFrame"))
+        btn_gui.pack(pady=6)
+
+        # Console button: open popup to select mode/difficulty then run console mode
+        btn_console = tk.Button(self, text="Start (Console)", width=20, command=self.launch_console_popup)
+        btn_console.pack(pady=6)
+
+        btn_quit = tk.Button(self, text="Quit", width=20, command=controller.destroy)
+        btn_quit.pack(pady=6)
+
+    def launch_console_popup(self):
+        # simple Toplevel to ask mode/difficulty
+        popup = tk.Toplevel(self)
+        popup.title("Console Mode - Choose Mode")
+        tk.Label(popup, text="Select Mode for Console:", font=("Arial", 12)).pack(padx=10, pady=8)
+
+        def set_mode(m):
+            popup.destroy()
+            if m == 2:
+                # ask difficulty
+                self.ask_difficulty_console()
+            else:
+                # launch console directly
+                self.controller.mode = m
+                self.controller.difficulty_depth = 4
+                self.controller.perfect = False
+                run_console_mode(self.master, self.controller, m, None)
+
+        tk.Button(popup, text="Player vs Player", width=25, command=lambda: set_mode(1)).pack(padx=10, pady=6)
+        tk.Button(popup, text="Player vs AI", width=25, command=lambda: set_mode(2)).pack(padx=10, pady=6)
+        tk.Button(popup, text="AI vs AI", width=25, command=lambda: set_mode(3)).pack(padx=10, pady=6)
+
+        popup.transient(self)
+        popup.grab_set()
+        self.wait_window(popup)
+
+    def ask_difficulty_console(self):
+        popup = tk.Toplevel(self)
+        popup.title("Choose Difficulty")
+        tk.Label(popup, text="Choose Difficulty:", font=("Arial", 12)).pack(padx=10, pady=8)
+
+        def set_diff(label):
+            popup.destroy()
+            mapping = {"Easy": 2, "Medium": 4, "Hard": 6, "Perfect": 6}
+            depth = mapping.get(label, 4)
+            self.controller.mode = 2
+            self.controller.difficulty_depth = depth
+            self.controller.perfect = label == "Perfect"
+            run_console_mode(self.master, self.controller, 2, depth, self.controller.perfect)
+
+        tk.Button(popup, text="Easy (Depth 2)", width=25, command=lambda: set_diff("Easy")).pack(padx=10, pady=6)
+        tk.Button(popup, text="Medium (Depth 4)", width=25, command=lambda: set_diff("Medium")).pack(padx=10, pady=6)
+        tk.Button(popup, text="Hard (Depth 6)", width=25, command=lambda: set_diff("Hard")).pack(padx=10, pady=6)
+        tk.Button(popup, text="Perfect (Solver)", width=25, command=lambda: set_diff("Perfect")).pack(padx=10, pady=6)
+
+        popup.transient(self)
+        popup.grab_set()
+        self.wait_window(popup)
+
+# Mode Selection Frame
+class ModeFrame(tk.Frame):
+    def __init__(self, parent, controller: App):
+        super().__init__(parent)
+        self.controller = controller
+        tk.Label(self, text="Select Game Mode", font=("Arial", 16)).pack(pady=10)
+        tk.Button(self, text="Player vs Player", width=25, command=self.choose_pvp).pack(pady=6)
+        tk.Button(self, text="Player vs AI", width=25, command=self.choose_pvai).pack(pady=6)
+        tk.Button(self, text="AI vs AI", width=25, command=self.choose_aivai).pack(pady=6)
+        tk.Button(self, text="Back", width=12, command=lambda: controller.show_frame("LauncherFrame")).pack(pady=8)
+
+    def choose_pvp(self):
+        self.controller.mode = 1
+        self.controller.difficulty_depth = 4
+        self.controller.perfect = False
+        self.controller.prepare_engine()
+        self.controller.show_frame("GameFrame")
+        self.controller.frames["GameFrame"].start_game()
+
+    def choose_pvai(self):
+        self.controller.mode = 2
+        # go to difficulty selection
+        self.controller.show_frame("DifficultyFrame")
+
+    def choose_aivai(self):
+        self.controller.mode = 3
+        self.controller.difficulty_depth = 4
+        self.controller.perfect = False
+        self.controller.prepare_engine()
+        self.controller.show_frame("GameFrame")
+        self.controller.frames["GameFrame"].start_game()
+
+# Difficulty Frame
+class DifficultyFrame(tk.Frame):
+    def __init__(self, parent, controller: App):
+        super().__init__(parent)
+        self.controller = controller
+        tk.Label(self, text="Select Difficulty (Player vs AI)", font=("Arial", 14)).pack(pady=10)
+        tk.Button(self, text="Easy (Depth 2)", width=25, command=lambda: self.choose("Easy")).pack(pady=6)
+        tk.Button(self, text="Medium (Depth 4)", width=25, command=lambda: self.choose("Medium")).pack(pady=6)
+        tk.Button(self, text="Hard (Depth 6)", width=25, command=lambda: self.choose("Hard")).pack(pady=6)
+        tk.Button(self, text="Perfect (Solver)", width=25, command=lambda: self.choose("Perfect")).pack(pady=6)
+        tk.Button(self, text="Back", width=12, command=lambda: controller.show_frame("ModeFrame")).pack(pady=8)
+
+    def choose(self, label):
+        # Perfect solves the position and searches at Hard depth when it can't
+        mapping = {"Easy": 2, "Medium": 4, "Hard": 6, "Perfect": 6}
+        self.controller.difficulty_depth = mapping.get(label, 4)
+        self.controller.perfect = label == "Perfect"
+        self.controller.prepare_engine()
+        self.controller.show_frame("GameFrame")
+        self.controller.frames["GameFrame"].start_game()
+
+# Game Frame
+class GameFrame(tk.Frame):
+    def __init__(self, parent, controller: App):
+        super().__init__(parent)
+        self.controller = controller
+        self.canvas = tk.Canvas(self, width=COLS*CELL_SIZE, height=ROWS*CELL_SIZE, bg="blue")
+        self.canvas.pack(pady=(10,0))
+        self.canvas.bind("<Button-1>", self.on_click)
+        # bottom control frame
+        ctrl = tk.Frame(self)
+        ctrl.pack(fill="x", pady=6)
+        self.status_label = tk.Label(ctrl, text="Status: Ready", anchor="w")
+        self.status_label.pack(side="left", padx=6)
+        tk.Button(ctrl, text="Restart", command=self.restart_game).pack(side="right", padx=6)
+        tk.Button(ctrl, text="Back to Menu", command=self.back_to_menu).pack(side="right")
+        # draw empty circles and keep ids
+        self.cell_ids = [[None for _ in range(COLS)] for __ in range(ROWS)]
+        for r in range(ROWS):
+            for c in range(COLS):
+                x1 = c*CELL_SIZE + 5
+                y1 = r*CELL_SIZE + 5
+                x2 = x1 + CELL_SIZE - 10
+                y2 = y1 + CELL_SIZE - 10
+                cid = self.canvas.create_oval(x1, y1, x2, y2, fill=EMPTY_COLOR, tags=f"cell_{r}_{c}")
+                self.cell_ids[r][c] = cid
+        # what the canvas shows, so update_board only touches changed cells
+        self.drawn = [[EMPTY] * COLS for _ in range(ROWS)]
+        self.drawn_board = None
+        self.drawn_moves = 0
+        # cells handle_game_over highlighted, restored on the next update
+        self.highlighted: List[Tuple[int, int]] = []
+        self.after_id = None
+        # AI searches run on one worker thread so the Tk loop never blocks
+        self.ai_executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_future = None
+        self.ai_cancel: Optional[threading.Event] = None
+        self.ai_started = 0.0
+        # set to stop the AI pondering on the human's turn (see start_pondering)
+        self.ponder_cancel: Optional[threading.Event] = None
+
+    def start_game(self):
+        # engine is prepared by controller
+        self.cancel_ai_search()
+        self.controller.prepare_engine()
+        self.engine = self.controller.engine
+        self.update_board()
+        self.status_label.config(text="Status: Game started")
+        # if AI to move first, schedule
+        if isinstance(self.engine.current, AIPlayer):
+            self.schedule_ai_move(300)
+        else:
+            self.start_pondering()
+
+    def update_board(self):
+        # each itemconfig is a Tk round-trip, so only redraw cells that
+        # differ from self.drawn: after one move that is just last_move,
+        # after a restart whatever the diff finds
+        board = self.engine.board
+        grid = board.grid
+        for r, c in self.highlighted:
+            self.canvas.itemconfig(self.cell_ids[r][c], outline="black", width=1)
+            # its fill is the highlight color now, so redraw it below
+            self.drawn[r][c] = None
+        if board is self.drawn_board and len(board.moves) == self.drawn_moves + 1:
+            cells = self.highlighted + [board.last_move]
+        else:
+            cells = [(r, c) for r in range(ROWS) for c in range(COLS)]
+        self.highlighted = []
+        for r, c in cells:
+            v = grid[r][c]
+            if v != self.drawn[r][c]:
+                color = EMPTY_COLOR
+                if v == PLAYER1: color = P1_COLOR
+                elif v == PLAYER2: color = P2_COLOR
+                self.canvas.itemconfig(self.cell_ids[r][c], fill=color)
+                self.drawn[r][c] = v
+        self.drawn_board = board
+        self.drawn_moves = len(board.moves)
+
+    def on_click(self, event):
+        if not isinstance(self.engine.current, HumanPlayer):
+            return
+        col = event.x // CELL_SIZE
+        if col not in self.engine.board.valid_moves():
+            return
+        # the AI's reply to `col` is either pondered already or searched next
+        self.stop_pondering()
+        winner = self.engine.make_move(col)
+        self.update_board()
+        if winner:
+            self.handle_game_over()
+            return
+        # schedule AI if next
+        if isinstance(self.engine.current, AIPlayer):
+            self.schedule_ai_move(300)
+
+    def schedule_ai_move(self, delay_ms):
+        if self.after_id:
+            self.after_cancel(self.after_id)
+        self.after_id = self.after(delay_ms, self.ai_move)
+
+    def start_pondering(self):
+        # PvAI: while the human thinks, the AI searches its reply to each
+        # of their moves on the worker thread; ai_move queues behind it
+        # once stop_pondering has cut it short
+        if not isinstance(self.engine.current, HumanPlayer):
+            return
+        ai_player = self.engine.p2 if self.engine.current is self.engine.p1 else self.engine.p1
+        if not isinstance(ai_player, AIPlayer):
+            return
+        self.stop_pondering()
+        self.ponder_cancel = threading.Event()
+        self.ai_executor.submit(ai_player.ponder, self.engine.board.copy(), self.ponder_cancel)
+
+    def stop_pondering(self):
+        if self.ponder_cancel is not None:
+            self.ponder_cancel.set()
+            self.ponder_cancel = None
+
+    def ai_move(self):
+        self.after_id = None
+        if not isinstance(self.engine.current, AIPlayer) or self.ai_future is not None:
+            return
+        # search a copy so the board the GUI draws is never touched off-thread
+        self.ai_cancel = threading.Event()
+        self.ai_started = time.perf_counter()
+        self.ai_future = self.ai_executor.submit(
+            self.engine.current.choose_move, self.engine.board.copy(), self.ai_cancel)
+        self.after_id = self.after(AI_POLL_MS, self.poll_ai_move)
+
+    def poll_ai_move(self):
+        self.after_id = None
+        future = self.ai_future
+        if future is None:
+            return
+        if not future.done():
+            nodes = self.engine.current.nodes
+            elapsed = max(time.perf_counter() - self.ai_started, 1e-6)
+            self.status_label.config(
+                text=f"Status: AI (P{self.engine.current.pid}) thinking... "
+                     f"{nodes:,} nodes ({nodes / elapsed:,.0f} nodes/s)")
+            self.after_id = self.after(AI_POLL_MS, self.poll_ai_move)
+            return
+        self.ai_future = None
+        self.ai_cancel = None
+        try:
+            col = future.result()
+        except SearchCancelled:
+            return
+        except Exception as e:
+            self.status_label.config(text=f"Status: AI (P{self.engine.current.pid}) failed: {e!r}")
+            return
+        ai_player = self.engine.current
+        status = f"Status: AI (P{ai_player.pid}) played {col}"
+        if ai_player.from_ponder:
+            status += " (pondered)"
+        if ai_player.last_solution is not None:
+            status += f" | solved: {describe_solver_score(*ai_player.last_solution)}"
+        elif ai_player.from_book:
+            status += " | opening book"
+        elif ai_player.ai.stats is not None:
+            status += f" | {ai_player.ai.stats.brief()}"
+        self.status_label.config(text=status)
+        winner = self.engine.make_move(col)
+        self.update_board()
+        if winner or self.engine.board.is_full():
+            self.handle_game_over()
+            return
+        # if next is AI too, continue
+        if isinstance(self.engine.current, AIPlayer):
+            self.schedule_ai_move(300)
+        else:
+            self.start_pondering()
+
+    def handle_game_over(self):
+        # highlight winning four if exists
+        coords = self.engine.board.winning_positions()
+        if coords:
+            for (r, c) in coords:
+                self.canvas.itemconfig(self.cell_ids[r][c], outline="white", width=3)
+                self.canvas.itemconfig(self.cell_ids[r][c], fill=HIGHLIGHT_COLOR)
+            self.highlighted = list(coords)
+        winner = self.engine.board.check_winner()
+        if winner:
+            self.status_label.config(text=f"Status: Player {winner} wins!")
+            messagebox.showinfo("Game Over", f"Player {winner} wins!")
+        else:
+            self.status_label.config(text="Status: Draw")
+            messagebox.showinfo("Game Over", "Draw!")
+        # cancel any scheduled AI moves
+        self.cancel_ai_search()
+
+    def cancel_ai_search(self):
+        if self.after_id:
+            self.after_cancel(self.after_id)
+            self.after_id = None
+        if self.ai_cancel is not None:
+            self.ai_cancel.set()
+        self.ai_future = None
+        self.ai_cancel = None
+        self.stop_pondering()
+
+    def destroy(self):
+        self.cancel_ai_search()
+        self.ai_executor.shutdown(wait=False)
+        super().destroy()
+
+    def restart_game(self):
+        # restart with same players and depths
+        self.cancel_ai_search()
+        self.controller.prepare_engine()
+        self.engine = self.controller.engine
+        self.update_board()
+        self.status_label.config(text="Status: Restarted")
+        if isinstance(self.engine.current, AIPlayer):
+            self.schedule_ai_move(300)
+        else:
+            self.start_pondering()
+
+    def back_to_menu(self):
+        # cancel pending AI callbacks and any search in progress
+        self.cancel_ai_search()
+        self.controller.show_frame("ModeFrame")
+
+# frame name -> class, for App.show_frame
+FRAME_CLASSES = {F.__name__: F for F in (LauncherFrame, ModeFrame, DifficultyFrame, GameFrame)}
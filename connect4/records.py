@@ -0,0 +1,192 @@
+"""Memory-mapped opening book and endgame table files."""
+
+import mmap
+import os
+import struct
+from typing import Tuple, Optional
+
+from .board import COLS, mirror_bits
+from .solver import BOARD_SIZE, board_masks
+
+# the data files sit next to the launcher script, one level above the package
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ============================
+# OPENING BOOK
+# ============================
+# File layout (little endian): a BOOK_HEADER (magic, version, plies covered,
+# record size, record count) followed by fixed-size BOOK_RECORDs sorted by
+# key; the endgame table below uses the same layout. The key is
+# position_key(), which a position shares with its mirror image, and moves
+# are stored for that canonical orientation. depth is the search depth that
+# produced the move, or BOOK_SOLVED when score is an exact Solver score.
+BOOK_MAGIC = b"C4BK"
+BOOK_VERSION = 2
+BOOK_HEADER = struct.Struct("<4sBBHI")
+BOOK_RECORD = struct.Struct("<QBBi")
+BOOK_KEY = struct.Struct("<Q")
+BOOK_SOLVED = 255
+BOOK_PATH = os.path.join(DATA_DIR, "opening_book.bin")
+
+def position_key(board) -> Tuple[int, bool]:
+    """Board-independent key shared by a position and its mirror image:
+    the smaller of the side-to-move stones + mask and its mirror_bits. The
+    flag is True when the mirror's key was taken, i.e. stored columns must
+    be flipped for this board."""
+    position, mask, _ = board_masks(board)
+    key = position + mask
+    mirrored = mirror_bits(key)
+    return (mirrored, True) if mirrored < key else (key, False)
+
+class SortedRecordFile:
+    """Read-only view of a header + key-sorted records file. The file is
+    memory-mapped and binary-searched in place, so opening it only reads the
+    header. The header's `limit` byte is format specific."""
+
+    MAGIC = b""
+    VERSION = 1
+    RECORD: struct.Struct = BOOK_RECORD
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < BOOK_HEADER.size:
+            self._mm.close()
+            raise ValueError(f"{path} is truncated")
+        magic, version, limit, record_size, count = BOOK_HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION or record_size != self.RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {self.VERSION} {type(self).__name__}")
+        if BOOK_HEADER.size + count * record_size > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{path} is truncated")
+        self.limit = limit
+        self.count = count
+        self.hits = 0
+
+    def __len__(self):
+        return self.count
+
+    def find(self, key: int) -> Optional[tuple]:
+        """The record stored under `key`, or None."""
+        mm, size, base = self._mm, self.RECORD.size, BOOK_HEADER.size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k = BOOK_KEY.unpack_from(mm, base + mid * size)[0]
+            if k < key:
+                lo = mid + 1
+            elif k > key:
+                hi = mid
+            else:
+                self.hits += 1
+                return self.RECORD.unpack_from(mm, base + mid * size)
+        return None
+
+    def close(self):
+        self._mm.close()
+
+    @classmethod
+    def write(cls, path: str, records: dict, limit: int):
+        """records: key -> rest of the record. Written sorted, via a temp file."""
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(BOOK_HEADER.pack(cls.MAGIC, cls.VERSION, limit, cls.RECORD.size, len(records)))
+            for key in sorted(records):
+                f.write(cls.RECORD.pack(key, *records[key]))
+        os.replace(tmp, path)
+
+class OpeningBook(SortedRecordFile):
+    """Book moves for the first `plies` plies (the header limit)."""
+
+    MAGIC = BOOK_MAGIC
+    VERSION = BOOK_VERSION
+    RECORD = BOOK_RECORD
+
+    def __init__(self, path: str = BOOK_PATH):
+        super().__init__(path)
+        self.plies = self.limit
+
+    def __contains__(self, board) -> bool:
+        return self.probe(board) is not None
+
+    def probe(self, board) -> Optional[Tuple[int, int, int]]:
+        """(move, depth, score) for the side to move, or None."""
+        if len(board.moves) >= self.plies:
+            return None
+        key, flipped = position_key(board)
+        record = self.find(key)
+        if record is None:
+            return None
+        _, move, depth, score = record
+        if flipped:
+            move = COLS - 1 - move
+        if move not in board.valid_moves():
+            return None
+        return move, depth, score
+
+def load_opening_book(path: str = BOOK_PATH) -> Optional[OpeningBook]:
+    """The book at `path`, or None if there is no usable book there."""
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError) as e:
+        if os.path.exists(path):
+            print(f"ignoring opening book {path}: {e}")
+        return None
+
+def write_opening_book(path: str, entries: dict, plies: int):
+    """entries: key -> (move, depth, score)."""
+    OpeningBook.write(path, entries, plies)
+
+# ============================
+# ENDGAME TABLE
+# ============================
+# Exact Solver scores of late positions, keyed like the opening book. The
+# header limit is the most empty cells a stored position has. Minimax probes
+# it below ENDGAME_EMPTY empty cells and solves misses on the spot.
+ENDGAME_MAGIC = b"C4EG"
+ENDGAME_VERSION = 2
+ENDGAME_RECORD = struct.Struct("<Qb")
+ENDGAME_PATH = os.path.join(DATA_DIR, "endgame_table.bin")
+
+class EndgameTable(SortedRecordFile):
+    """Lazily opened: nothing is read until the first probe, and a missing
+    or unreadable file behaves like an empty table."""
+
+    MAGIC = ENDGAME_MAGIC
+    VERSION = ENDGAME_VERSION
+    RECORD = ENDGAME_RECORD
+
+    def __init__(self, path: str = ENDGAME_PATH):
+        self.path = path
+        self.loaded = False
+        self._mm = None
+        self.limit = self.count = self.hits = 0
+
+    def _load(self):
+        self.loaded = True
+        try:
+            super().__init__(self.path)
+        except ValueError as e:
+            print(f"ignoring endgame table {self.path}: {e}")
+        except OSError:
+            pass
+
+    def probe_masks(self, position: int, mask: int) -> Optional[int]:
+        """Exact score for the side to move (see Solver), or None."""
+        if not self.loaded:
+            self._load()
+        if not self.count or BOARD_SIZE - mask.bit_count() > self.limit:
+            return None
+        key = position + mask
+        record = self.find(min(key, mirror_bits(key)))
+        return None if record is None else record[1]
+
+    def probe(self, board) -> Optional[int]:
+        position, mask, _ = board_masks(board)
+        return self.probe_masks(position, mask)
+
+    def close(self):
+        if self._mm is not None:
+            super().close()
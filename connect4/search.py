@@ -0,0 +1,699 @@
+"""Minimax / PVS search with alpha-beta pruning."""
+
+import math
+import threading
+import time
+from typing import List, Tuple, Optional
+
+from .board import (BOARD_MASK, BOTTOM_MASK, Board, COLS, EMPTY, PLAYER1, PLAYER2, ROWS,
+                    bit_columns, winning_cells)
+from .errors import SearchCancelled, SearchTimeout
+from .records import ENDGAME_PATH, EndgameTable
+from .solver import Solver, board_masks
+from .tt import TT_EXACT, TT_LOWER, TT_UPPER, TranspositionTable
+
+# ============================
+# MINIMAX with Alpha-Beta
+# ============================
+WIN_SCORE = 1_000_000
+MOVE_ORDERINGS = ("killer_history", "center")
+SEARCH_ALGORITHMS = ("minimax", "pvs")
+# half-width of the PVS aspiration window around the previous iteration's score
+ASPIRATION_WINDOW = 50
+# root searches shallower than this are not worth sending to worker processes
+PARALLEL_MIN_DEPTH = 4
+# how often pending work is polled: worker results here, the AI thread in the GUI
+AI_POLL_MS = 100
+# positions with at most ENDGAME_EMPTY empty cells are scored exactly (see
+# records.EndgameTable): wins as ENDGAME_WIN plus a bonus for winning sooner, which
+# stays below an immediate WIN_SCORE and above any heuristic score
+ENDGAME_EMPTY = 12
+ENDGAME_WIN = WIN_SCORE - ROWS * COLS
+
+class SearchStats:
+    """Counters for one best_move call (Minimax(collect_stats=True))."""
+
+    COUNTERS = ("nodes", "leaf_evals", "beta_cutoffs", "first_move_cutoffs", "tt_hits",
+                "endgame_probes", "max_depth")
+
+    def __init__(self):
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.beta_cutoffs = 0
+        # cutoffs caused by the first move tried; a high ratio means good ordering
+        self.first_move_cutoffs = 0
+        self.tt_hits = 0
+        # positions scored exactly by the endgame table or solver
+        self.endgame_probes = 0
+        # deepest ply reached below the root
+        self.max_depth = 0
+        self.completed_depth = 0
+        # (depth, milliseconds, nodes) per finished iteration
+        self.iterations: List[Tuple[int, float, int]] = []
+
+    @property
+    def first_move_cutoff_ratio(self) -> float:
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    @property
+    def elapsed_ms(self) -> float:
+        return sum(ms for _, ms, _ in self.iterations)
+
+    def merge(self, counts: dict):
+        for name in self.COUNTERS:
+            if name == "max_depth":
+                self.max_depth = max(self.max_depth, counts[name])
+            else:
+                setattr(self, name, getattr(self, name) + counts[name])
+
+    def as_dict(self) -> dict:
+        d = {name: getattr(self, name) for name in self.COUNTERS}
+        d["first_move_cutoff_ratio"] = round(self.first_move_cutoff_ratio, 4)
+        d["completed_depth"] = self.completed_depth
+        d["iterations"] = [list(it) for it in self.iterations]
+        return d
+
+    def brief(self) -> str:
+        ms = self.elapsed_ms
+        nps = self.nodes / ms if ms else 0
+        return (f"d{self.completed_depth} {self.nodes:,} nodes {nps:,.0f}k/s "
+                f"{self.first_move_cutoff_ratio:.0%} 1st-move cuts")
+
+    def summary(self) -> str:
+        ms = self.elapsed_ms
+        nps = self.nodes / ms * 1000 if ms else 0
+        return (f"depth {self.completed_depth} (max ply {self.max_depth}), {self.nodes:,} nodes "
+                f"in {ms:.0f} ms ({nps:,.0f}/s), {self.beta_cutoffs:,} cutoffs "
+                f"({self.first_move_cutoff_ratio:.0%} first move), {self.tt_hits:,} TT hits")
+
+class Minimax:
+    def __init__(self, in_place: bool = True, tt: Optional[TranspositionTable] = None,
+                 use_tt: bool = True, workers: int = 1, incremental_eval: bool = True,
+                 collect_stats: bool = False, ordering: str = "killer_history",
+                 algorithm: str = "minimax", endgame_empty: int = ENDGAME_EMPTY,
+                 endgame_path: Optional[str] = ENDGAME_PATH, prune_threats: bool = True,
+                 endgame_tt: Optional[TranspositionTable] = None):
+        # in_place: play/undo moves on one working board instead of copying
+        # the board for every child node
+        self.in_place = in_place
+        # incremental_eval: the working board keeps its score up to date on
+        # every move, so leaves read it in O(1)
+        self.incremental_eval = incremental_eval
+        # workers > 1: split root moves across a process pool
+        self.workers = workers
+        # a ProcessPoolExecutor, created by the first parallel search, and a
+        # multiprocessing.Event its workers poll so that an abandoned search
+        # stops the root moves they are still searching
+        self.pool = None
+        self.pool_stop = None
+        # scores are from the searching player's point of view, so the table
+        # is only valid for one player at a time (see best_move)
+        if tt is None and use_tt:
+            tt = TranspositionTable()
+        self.tt = tt
+        self.tt_player: Optional[int] = None
+        self.nodes = 0
+        self.deadline: Optional[float] = None
+        self.cancel_event: Optional[threading.Event] = None
+        self.completed_depth = 0
+        # root score of the last best_move, from the searching player's view
+        self.last_score: Optional[int] = None
+        # depth of the current root iteration, so nodes know their ply
+        self.root_depth = 0
+        self.collect_stats = collect_stats
+        self.stats: Optional[SearchStats] = None
+        # ordering="center": static center-first order at every node;
+        # "killer_history": TT move, then this ply's killer moves, then moves
+        # ranked by the history table, center-first among equals
+        if ordering not in MOVE_ORDERINGS:
+            raise ValueError(f"ordering must be one of {MOVE_ORDERINGS}")
+        self.ordering = ordering
+        # algorithm="minimax": the two-sided alpha-beta in _minimax;
+        # "pvs": negamax principal variation search (_pvs) with aspiration
+        # windows between iterations
+        if algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {SEARCH_ALGORITHMS}")
+        self.algorithm = algorithm
+        # prune_threats: take immediate wins, make forced blocks and skip
+        # moves right below an opponent's winning cell without searching
+        # them (see _threat_moves)
+        self.prune_threats = prune_threats
+        # endgame_empty: score positions with this many empty cells or fewer
+        # exactly, from the table at endgame_path (loaded on first use) or by
+        # solving them on the spot; 0 turns this off. endgame_tt is the
+        # solver's table; scores there are from the side to move, so
+        # searchers for both players may share one
+        self.endgame_empty = endgame_empty
+        self.endgame_path = endgame_path
+        self.endgame: Optional[EndgameTable] = None
+        self.endgame_solver: Optional[Solver] = None
+        if endgame_empty:
+            if endgame_path:
+                self.endgame = EndgameTable(endgame_path)
+            if endgame_tt is None:
+                endgame_tt = TranspositionTable(100_000, replace="always")
+            self.endgame_solver = Solver(endgame_tt)
+        # killers[2 * ply], killers[2 * ply + 1]: the last two cutoff moves
+        # at that ply, newest first
+        self.killers: List[Optional[int]] = []
+        # history[(piece * COLS + col) * ROWS + row]: how often that drop
+        # caused a cutoff, weighted by remaining depth squared
+        self.history: List[int] = []
+        self.reset_move_ordering()
+
+    def best_move(self, board: Board, depth: int, player: int,
+                  time_budget_ms: Optional[float] = None,
+                  cancel_event: Optional[threading.Event] = None) -> int:
+        """Return the best column for `player`.
+
+        Without a time budget this is a fixed-depth search. With one, it runs
+        iterative deepening (1, 2, ... up to `depth`) and returns the move of
+        the deepest iteration that finished in time; depth 1 always finishes.
+        Setting `cancel_event` from another thread makes this raise
+        SearchCancelled shortly after.
+        """
+        self.prepare(player)
+        self.completed_depth = 0
+        self.cancel_event = cancel_event
+        # never mutate the caller's board
+        work = board.copy()
+        if self.incremental_eval:
+            work.enable_eval_tracking()
+        if time_budget_ms is None and self.algorithm == "minimax":
+            self.deadline = None
+            best_col, self.last_score = self._search_iteration(work, depth, player, None, None)
+            return best_col
+        # PVS always deepens one ply at a time so every iteration gets an
+        # aspiration window from the previous one
+        start = time.perf_counter()
+        empty = sum(row.count(EMPTY) for row in board.grid)
+        best_col = None
+        score = None
+        for d in range(1, max(1, min(depth, empty)) + 1):
+            if time_budget_ms is None or d == 1:
+                self.deadline = None
+            else:
+                self.deadline = start + time_budget_ms / 1000
+            try:
+                best_col, score = self._search_iteration(work, d, player, best_col, score)
+            except SearchCancelled:
+                raise
+            except SearchTimeout:
+                break
+            # a forced or proven win or loss will not change with more depth
+            if abs(score) >= ENDGAME_WIN:
+                break
+            if time_budget_ms is not None and time.perf_counter() - start >= time_budget_ms / 1000:
+                break
+        self.deadline = None
+        self.last_score = score
+        if self.stats is not None:
+            self.stats.nodes = self.nodes
+        return best_col
+
+    def best_move_with_stats(self, board: Board, depth: int, player: int,
+                             time_budget_ms: Optional[float] = None,
+                             cancel_event: Optional[threading.Event] = None) -> Tuple[int, SearchStats]:
+        """best_move, also returning the SearchStats of the search."""
+        collect, self.collect_stats = self.collect_stats, True
+        try:
+            col = self.best_move(board, depth, player, time_budget_ms, cancel_event)
+        finally:
+            self.collect_stats = collect
+        return col, self.stats
+
+    def _search_iteration(self, work: Board, depth: int, player: int, first_col: Optional[int],
+                          prev_score: Optional[float]) -> Tuple[int, float]:
+        start = time.perf_counter()
+        nodes = self.nodes
+        self.root_depth = depth
+        if self.algorithm == "pvs" and prev_score is not None and abs(prev_score) < WIN_SCORE:
+            alpha, beta = prev_score - ASPIRATION_WINDOW, prev_score + ASPIRATION_WINDOW
+        else:
+            alpha, beta = -math.inf, math.inf
+        while True:
+            result = self._search_root(work, depth, player, first_col, alpha, beta)
+            # outside the aspiration window: widen that side and search again
+            if result[1] <= alpha:
+                alpha = -math.inf
+            elif result[1] >= beta:
+                beta = math.inf
+            else:
+                break
+        self.completed_depth = depth
+        if self.stats is not None:
+            self.stats.completed_depth = depth
+            self.stats.nodes = self.nodes
+            self.stats.iterations.append(
+                (depth, round((time.perf_counter() - start) * 1000, 3), self.nodes - nodes))
+        return result
+
+    def prepare(self, player: int):
+        # scores are from `player`'s side, so a table filled for the other
+        # player is useless
+        if self.tt is not None and self.tt_player != player:
+            self.tt.clear()
+            self.tt_player = player
+        self.nodes = 0
+        self.stats = SearchStats() if self.collect_stats else None
+        self.reset_move_ordering()
+
+    def reset_move_ordering(self):
+        # flat lists: a fraction of the memory of nested per-ply/per-column
+        # lists, which matters with one searcher per AI player
+        self.killers = [None] * (2 * (ROWS * COLS + 1))
+        self.history = [0] * (3 * COLS * ROWS)
+
+    def settings(self) -> dict:
+        """Constructor arguments that worker processes should copy."""
+        return {"in_place": self.in_place, "use_tt": self.tt is not None,
+                "incremental_eval": self.incremental_eval, "collect_stats": self.collect_stats,
+                "ordering": self.ordering, "algorithm": self.algorithm,
+                "endgame_empty": self.endgame_empty, "endgame_path": self.endgame_path,
+                "prune_threats": self.prune_threats}
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+            self.pool_stop = None
+
+    def _check_stop(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def _search_root(self, work: Board, depth: int, player: int, first_col: Optional[int],
+                     alpha: float = -math.inf, beta: float = math.inf) -> Tuple[int, float]:
+        # `work` is left unchanged unless SearchTimeout is raised. The
+        # alpha/beta window only applies to PVS; the parallel search always
+        # uses the full window.
+        best_score = -math.inf
+        best_col = work.valid_moves()[0]
+        ordered = sorted(work.valid_moves(), key=lambda x: abs(x - 3))
+        if self.prune_threats:
+            outcome, moves = self._threat_moves(work, player)
+            if outcome:
+                return moves[0], WIN_SCORE if outcome > 0 else -WIN_SCORE
+            ordered = [c for c in ordered if c in moves]
+        if work.is_symmetric():
+            # mirrored moves have the same score: search the left half only
+            ordered = [c for c in ordered if c <= COLS - 1 - c]
+            if first_col is not None and first_col > COLS - 1 - first_col:
+                first_col = COLS - 1 - first_col
+        if first_col in ordered:
+            ordered.remove(first_col)
+            ordered.insert(0, first_col)
+        if self.workers > 1 and depth >= PARALLEL_MIN_DEPTH and len(ordered) > 1:
+            return self._search_root_parallel(work, depth, player, ordered)
+        if self.algorithm == "pvs":
+            return self._search_root_pvs(work, depth, player, ordered, alpha, beta)
+        for col in ordered:
+            b = work if self.in_place else work.copy()
+            b.drop_piece(col, player)
+            score = self._minimax(b, depth - 1, -math.inf, math.inf, False, player)
+            if self.in_place:
+                b.undo_move(col)
+            if score > best_score:
+                best_score = score
+                best_col = col
+        return best_col, best_score
+
+    def _search_root_parallel(self, work: Board, depth: int, player: int,
+                              ordered: List[int]) -> Tuple[int, float]:
+        # Young brothers wait: search the first move here for a bound, then
+        # hand the other root moves to the pool, each with the best score
+        # known when it is submitted as alpha. A child that does not beat its
+        # alpha cannot be the best move, so only exact results are kept.
+        first = ordered[0]
+        b = work if self.in_place else work.copy()
+        b.drop_piece(first, player)
+        bound = self._score_root_child(b, depth, player, -math.inf)
+        if self.in_place:
+            b.undo_move(first)
+        scores = {first: bound}
+        # imported here so that importing the engine does not pull in
+        # multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        if self.pool is None:
+            import multiprocessing
+            self.pool_stop = multiprocessing.Event()
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_search_worker,
+                                            initargs=(self.pool_stop,))
+        settings = self.settings()
+        queue = ordered[1:]
+        pending = {}
+        try:
+            while queue or pending:
+                while queue and len(pending) < self.workers:
+                    col = queue.pop(0)
+                    child = work.copy()
+                    child.drop_piece(col, player)
+                    time_left = None if self.deadline is None else max(0.0, self.deadline - time.perf_counter())
+                    future = self.pool.submit(_search_root_child, settings, child, depth,
+                                              player, bound, time_left)
+                    pending[future] = (col, bound)
+                done, _ = wait(pending, timeout=AI_POLL_MS / 1000, return_when=FIRST_COMPLETED)
+                for future in done:
+                    col, alpha = pending.pop(future)
+                    score, nodes, counts = future.result()
+                    self.nodes += nodes
+                    if self.stats is not None and counts is not None:
+                        self.stats.merge(counts)
+                    if score is None:
+                        raise SearchTimeout()
+                    if score > alpha:
+                        scores[col] = score
+                        bound = max(bound, score)
+                self._check_stop()
+        except (SearchTimeout, SearchCancelled):
+            for future in pending:
+                future.cancel()
+            # the children still running stop at their next node check; wait
+            # for them so the next search gets the whole pool
+            self.pool_stop.set()
+            wait(pending)
+            self.pool_stop.clear()
+            raise
+        best_col = first
+        for col in ordered:
+            if col in scores and scores[col] > scores[best_col]:
+                best_col = col
+        return best_col, scores[best_col]
+
+    def _search_root_pvs(self, work: Board, depth: int, player: int, ordered: List[int],
+                         alpha: float, beta: float) -> Tuple[int, float]:
+        opp = PLAYER1 if player == PLAYER2 else PLAYER2
+        best_score = -math.inf
+        best_col = ordered[0]
+        for i, col in enumerate(ordered):
+            b = work if self.in_place else work.copy()
+            b.drop_piece(col, player)
+            if i == 0:
+                score = -self._pvs(b, depth - 1, -beta, -alpha, opp, player)
+            else:
+                score = -self._pvs(b, depth - 1, -alpha - 1, -alpha, opp, player)
+                if alpha < score < beta:
+                    score = -self._pvs(b, depth - 1, -beta, -alpha, opp, player)
+            if self.in_place:
+                b.undo_move(col)
+            if score > best_score:
+                best_score, best_col = score, col
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_col, best_score
+
+    def _score_root_child(self, board: Board, root_depth: int, player: int, alpha: float) -> float:
+        """Score of a root move already played on `board`, from `player`'s
+        side; only exact if it is above `alpha`."""
+        if self.algorithm == "pvs":
+            opp = PLAYER1 if player == PLAYER2 else PLAYER2
+            return -self._pvs(board, root_depth - 1, -math.inf, -alpha, opp, player)
+        return self._minimax(board, root_depth - 1, alpha, math.inf, False, player)
+
+    def _threat_moves(self, board: Board, side: int) -> Tuple[int, List[int]]:
+        """Settle what the threat masks can for `side` to move: (1, [win])
+        if it wins immediately, (-1, [a threat]) if the opponent has two
+        immediate wins, else (0, columns worth searching): the forced block,
+        or the moves not right below an opponent's winning cell."""
+        # Board.winning_moves / unsafe_moves, inlined: this runs at every node
+        mask = board.mask
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        wins = winning_cells(board.stones(side), mask) & possible
+        if wins:
+            return 1, bit_columns(wins)[:1]
+        threats = winning_cells(board.stones(PLAYER1 if side == PLAYER2 else PLAYER2), mask)
+        forced = threats & possible
+        if forced:
+            # one playable cell per column, so two bits are two threats
+            return (-1 if forced & (forced - 1) else 0), bit_columns(forced)
+        safe = possible & ~(threats >> 1)
+        # if every move is unsafe the game is lost anyway; search them all
+        return 0, bit_columns(safe or possible)
+
+    def _order_moves(self, board: Board, ply: int, piece: int, tt_move: Optional[int],
+                     valid: Optional[List[int]] = None) -> List[int]:
+        if valid is None:
+            valid = board.valid_moves()
+        if self.ordering == "center":
+            ordered = sorted(valid, key=lambda c: abs(c - 3))
+        else:
+            hist = self.history
+            base = piece * COLS * ROWS + ROWS - 1
+            ordered = sorted(valid, key=lambda c: (-hist[base + c * ROWS - board.height(c)], abs(c - 3)))
+            for killer in (self.killers[2 * ply + 1], self.killers[2 * ply]):
+                if killer is not None and killer in valid:
+                    ordered.remove(killer)
+                    ordered.insert(0, killer)
+        if tt_move in valid:
+            ordered.remove(tt_move)
+            ordered.insert(0, tt_move)
+        return ordered
+
+    def _record_cutoff(self, board: Board, ply: int, piece: int, col: int, depth: int):
+        # `board` is back to the position before `col` was played
+        if self.ordering == "center":
+            return
+        killers = self.killers
+        k = 2 * ply
+        if killers[k] != col:
+            killers[k + 1] = killers[k]
+            killers[k] = col
+        self.history[(piece * COLS + col) * ROWS + ROWS - 1 - board.height(col)] += depth * depth
+
+    def _minimax(self, board: Board, depth: int, alpha: float, beta: float, maximizing: bool, player: int) -> int:
+        self.nodes += 1
+        if self.nodes & 255 == 0:
+            self._check_stop()
+        stats = self.stats
+        if stats is not None and self.root_depth - depth > stats.max_depth:
+            stats.max_depth = self.root_depth - depth
+        # only the last piece can have made a new four; it was played by the
+        # side that is not to move here
+        if board.last_move_wins():
+            return -WIN_SCORE if maximizing else WIN_SCORE
+        if ROWS * COLS - len(board.moves) <= self.endgame_empty and not board.is_full():
+            score = self._endgame_score(board)
+            return score if maximizing else -score
+        if depth == 0 or board.is_full():
+            if stats is not None:
+                stats.leaf_evals += 1
+            return board.score_position(player)
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            # a position and its mirror share one entry; the stored move is
+            # for the canonical side and flipped back here
+            flip = board.is_mirrored()
+            tt_key = (board.canonical_key, maximizing)
+            entry = tt.get(tt_key)
+            if entry is not None:
+                if stats is not None:
+                    stats.tt_hits += 1
+                e_depth, e_score, e_flag, tt_move = entry
+                if flip and tt_move is not None:
+                    tt_move = COLS - 1 - tt_move
+                if e_depth >= depth:
+                    if e_flag == TT_EXACT:
+                        return e_score
+                    if e_flag == TT_LOWER:
+                        alpha = max(alpha, e_score)
+                    else:
+                        beta = min(beta, e_score)
+                    if alpha >= beta:
+                        return e_score
+        alpha_orig, beta_orig = alpha, beta
+        ply = self.root_depth - depth
+        opp = PLAYER1 if player == PLAYER2 else PLAYER2
+        moves = None
+        # at depth 1 the children are static leaves; pruning them saves less
+        # than the threat masks cost
+        if self.prune_threats and depth > 1:
+            outcome, moves = self._threat_moves(board, player if maximizing else opp)
+            if outcome:
+                # the side to move wins now, or cannot stop both threats
+                return WIN_SCORE if (outcome > 0) == maximizing else -WIN_SCORE
+        ordered = self._order_moves(board, ply, player if maximizing else opp, tt_move, moves)
+        best_col = None
+        if maximizing:
+            value = -math.inf
+            for i, col in enumerate(ordered):
+                b = board if self.in_place else board.copy()
+                b.drop_piece(col, player)
+                score = self._minimax(b, depth - 1, alpha, beta, False, player)
+                if self.in_place:
+                    b.undo_move(col)
+                if score > value:
+                    value, best_col = score, col
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    if stats is not None:
+                        stats.beta_cutoffs += 1
+                        stats.first_move_cutoffs += i == 0
+                    self._record_cutoff(board, ply, player, col, depth)
+                    break
+        else:
+            value = math.inf
+            for i, col in enumerate(ordered):
+                b = board if self.in_place else board.copy()
+                b.drop_piece(col, opp)
+                score = self._minimax(b, depth - 1, alpha, beta, True, player)
+                if self.in_place:
+                    b.undo_move(col)
+                if score < value:
+                    value, best_col = score, col
+                beta = min(beta, value)
+                if alpha >= beta:
+                    if stats is not None:
+                        stats.beta_cutoffs += 1
+                        stats.first_move_cutoffs += i == 0
+                    self._record_cutoff(board, ply, opp, col, depth)
+                    break
+        if tt is not None:
+            if value <= alpha_orig:
+                flag = TT_UPPER
+            elif value >= beta_orig:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            if flip and best_col is not None:
+                best_col = COLS - 1 - best_col
+            tt.store(tt_key, depth, value, flag, best_col)
+        return value
+
+    def _endgame_score(self, board: Board) -> int:
+        """Exact score for the side to move, on the ENDGAME_WIN scale: from
+        the endgame table if it has the position, else from the solver."""
+        position, mask, stones = board_masks(board)
+        score = None
+        if self.endgame is not None:
+            score = self.endgame.probe_masks(position, mask)
+        if score is None:
+            score = self.endgame_solver.solve_masks(position, mask, stones,
+                                                    self.deadline, self.cancel_event)
+        if self.stats is not None:
+            self.stats.endgame_probes += 1
+        if score > 0:
+            return ENDGAME_WIN + score
+        return -ENDGAME_WIN + score if score < 0 else 0
+
+    def _pvs(self, board: Board, depth: int, alpha: float, beta: float, side: int, player: int) -> float:
+        """Negamax principal variation search. Scores are from the point of
+        view of `side` (the player to move); `player` is the searching
+        player, whose heuristic is negated for the opponent."""
+        self.nodes += 1
+        if self.nodes & 255 == 0:
+            self._check_stop()
+        stats = self.stats
+        if stats is not None and self.root_depth - depth > stats.max_depth:
+            stats.max_depth = self.root_depth - depth
+        # the last piece was the opponent's
+        if board.last_move_wins():
+            return -WIN_SCORE
+        if ROWS * COLS - len(board.moves) <= self.endgame_empty and not board.is_full():
+            return self._endgame_score(board)
+        if depth == 0 or board.is_full():
+            if stats is not None:
+                stats.leaf_evals += 1
+            score = board.score_position(player)
+            return score if side == player else -score
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            # a position and its mirror share one entry; the stored move is
+            # for the canonical side and flipped back here
+            flip = board.is_mirrored()
+            tt_key = (board.canonical_key, side == player)
+            entry = tt.get(tt_key)
+            if entry is not None:
+                if stats is not None:
+                    stats.tt_hits += 1
+                e_depth, e_score, e_flag, tt_move = entry
+                if flip and tt_move is not None:
+                    tt_move = COLS - 1 - tt_move
+                if e_depth >= depth:
+                    if e_flag == TT_EXACT:
+                        return e_score
+                    if e_flag == TT_LOWER:
+                        alpha = max(alpha, e_score)
+                    else:
+                        beta = min(beta, e_score)
+                    if alpha >= beta:
+                        return e_score
+        alpha_orig = alpha
+        ply = self.root_depth - depth
+        other = PLAYER1 if side == PLAYER2 else PLAYER2
+        moves = None
+        if self.prune_threats and depth > 1:
+            outcome, moves = self._threat_moves(board, side)
+            if outcome:
+                return WIN_SCORE if outcome > 0 else -WIN_SCORE
+        best_score = -math.inf
+        best_col = None
+        for i, col in enumerate(self._order_moves(board, ply, side, tt_move, moves)):
+            b = board if self.in_place else board.copy()
+            b.drop_piece(col, side)
+            if i == 0:
+                score = -self._pvs(b, depth - 1, -beta, -alpha, other, player)
+            else:
+                # null window: only prove this move is no better than alpha
+                score = -self._pvs(b, depth - 1, -alpha - 1, -alpha, other, player)
+                if alpha < score < beta:
+                    score = -self._pvs(b, depth - 1, -beta, -alpha, other, player)
+            if self.in_place:
+                b.undo_move(col)
+            if score > best_score:
+                best_score, best_col = score, col
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                if stats is not None:
+                    stats.beta_cutoffs += 1
+                    stats.first_move_cutoffs += i == 0
+                self._record_cutoff(board, ply, side, col, depth)
+                break
+        if tt is not None:
+            if best_score <= alpha_orig:
+                flag = TT_UPPER
+            elif best_score >= beta:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            if flip and best_col is not None:
+                best_col = COLS - 1 - best_col
+            tt.store(tt_key, depth, best_score, flag, best_col)
+        return best_score
+
+# one Minimax per settings in each worker process, so its transposition
+# table survives between root moves
+_worker_searchers = {}
+# set by the parent Minimax when it abandons a parallel search
+_worker_stop = None
+
+def _init_search_worker(stop_event):
+    """Process-pool initializer for _search_root_child."""
+    global _worker_stop
+    _worker_stop = stop_event
+
+def _search_root_child(settings: dict, board: Board, root_depth: int, player: int,
+                       alpha: float, time_left: Optional[float]):
+    """Process-pool entry point: score one root move (already played on
+    `board`). Returns (score, nodes, stats counters or None); score is None
+    if `time_left` ran out or the parent abandoned the search."""
+    key = tuple(sorted(settings.items()))
+    ai = _worker_searchers.get(key)
+    if ai is None:
+        ai = _worker_searchers[key] = Minimax(**settings)
+    ai.prepare(player)
+    ai.cancel_event = _worker_stop
+    ai.root_depth = root_depth
+    ai.deadline = None if time_left is None else time.perf_counter() + time_left
+    try:
+        score = ai._score_root_child(board, root_depth, player, alpha)
+    except (SearchTimeout, SearchCancelled):
+        score = None
+    counts = None
+    if ai.stats is not None:
+        counts = {name: getattr(ai.stats, name) for name in SearchStats.COUNTERS}
+    return score, ai.nodes, counts
@@ -0,0 +1,104 @@
+"""Headless AI vs AI games (`selfplay` subcommand)."""
+
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List
+
+from .board import BOARD_CLASSES
+from .game import AIPlayer, GameEngine
+
+# ============================
+# HEADLESS SELF-PLAY (AI vs AI, no Tk)
+# ============================
+def parse_ai_spec(spec: str) -> dict:
+    """'depth=6,time_budget_ms=200' -> AIPlayer keyword arguments."""
+    options = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected name=value, got {item!r}")
+        try:
+            options[name.strip()] = json.loads(value)
+        except ValueError:
+            options[name.strip()] = value.strip()
+    return options
+
+def play_selfplay_game(game_id: int, p1_options: dict, p2_options: dict,
+                       board: str = "bitboard", random_plies: int = 2) -> dict:
+    """Play one AI vs AI game and return its record.
+
+    The first `random_plies` moves are random (seeded by game_id) so that
+    games between deterministic engines differ.
+    """
+    p1 = AIPlayer(1, verbose=False, **p1_options)
+    p2 = AIPlayer(2, verbose=False, **p2_options)
+    engine = GameEngine(p1, p2, BOARD_CLASSES[board])
+    rng = random.Random(game_id)
+    moves, move_times_ms, nodes = [], [], []
+    winner = None
+    try:
+        while True:
+            start = time.perf_counter()
+            if len(moves) < random_plies:
+                col = rng.choice(engine.board.valid_moves())
+                searched = 0
+            else:
+                col = engine.current.choose_move(engine.board)
+                searched = engine.current.nodes
+            move_times_ms.append(round((time.perf_counter() - start) * 1000, 3))
+            nodes.append(searched)
+            moves.append(col)
+            winner = engine.make_move(col)
+            if winner or engine.board.is_full():
+                break
+    finally:
+        p1.ai.close()
+        p2.ai.close()
+    return {
+        "game": game_id,
+        "p1": p1_options,
+        "p2": p2_options,
+        "winner": winner or 0,
+        "moves": moves,
+        "move_times_ms": move_times_ms,
+        "nodes": nodes,
+    }
+
+def run_selfplay(games: int, p1_options: dict, p2_options: dict, out_path: str,
+                 processes: int = 1, board: str = "bitboard", random_plies: int = 2) -> dict:
+    """Play `games` games across a process pool, appending one JSON line per
+    finished game to `out_path`. Returns a summary."""
+    summary = {"games": 0, "p1_wins": 0, "p2_wins": 0, "draws": 0, "nodes": 0, "ai_time_ms": 0.0}
+    with open(out_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(play_selfplay_game, g, p1_options, p2_options, board, random_plies)
+                   for g in range(games)]
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            summary["games"] += 1
+            summary[{0: "draws", 1: "p1_wins", 2: "p2_wins"}[record["winner"]]] += 1
+            summary["nodes"] += sum(record["nodes"])
+            summary["ai_time_ms"] += sum(t for t, n in zip(record["move_times_ms"], record["nodes"]) if n)
+    return summary
+
+def selfplay_main(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="selfplay", description="Headless AI vs AI games, JSONL output")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--p1", default="depth=4", help="AIPlayer options, e.g. depth=6,time_budget_ms=200")
+    parser.add_argument("--p2", default="depth=4")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--board", choices=sorted(BOARD_CLASSES), default="bitboard")
+    parser.add_argument("--random-plies", type=int, default=2)
+    parser.add_argument("--out", default="selfplay.jsonl")
+    args = parser.parse_args(argv)
+    summary = run_selfplay(args.games, parse_ai_spec(args.p1), parse_ai_spec(args.p2), args.out,
+                           args.processes, args.board, args.random_plies)
+    seconds = summary["ai_time_ms"] / 1000
+    print(f"{summary['games']} games: P1 {summary['p1_wins']} / P2 {summary['p2_wins']} / "
+          f"draws {summary['draws']}; {summary['nodes']:,} nodes in {seconds:.1f}s AI time "
+          f"({summary['nodes'] / max(seconds, 1e-9):,.0f} nodes/s) -> {args.out}")
@@ -0,0 +1,456 @@
+"""Multi-session asyncio game server and its load generator (`serve`, `loadgen`)."""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from .board import BitBoard, PLAYER1, PLAYER2, board_from_moves
+from .game import AIPlayer, GameEngine, HumanPlayer
+from .records import load_opening_book
+from .tt import TranspositionTable
+
+# ============================
+# GAME SERVER (asyncio, newline-delimited JSON, no Tk)
+# ============================
+# Every request and response is one JSON object per line. Requests may carry
+# an "id", echoed in the response, so a client can keep several requests in
+# flight on one connection:
+#   {"op": "new", "depth": 4, "ai_first": false}  -> session, you, moves, ai_move
+#   {"op": "move", "session": 1, "col": 3}        -> ai_move, moves, over, winner
+#   {"op": "close", "session": 1}
+#   {"op": "stats"}                               -> sessions, pending, ai_moves
+# Errors come back as {"ok": false, "error": "..."}. Sessions belong to their
+# connection and are dropped with it or when their game ends.
+SERVER_PORT = 7444
+SERVER_MAX_DEPTH = 8
+SERVER_MAX_SESSIONS = 10_000
+SERVER_MAX_INFLIGHT = 64  # unanswered requests per connection
+
+SERVER_TT_MB = 256  # transposition tables of all AI worker processes together
+SERVER_MIN_WORKER_TT_MB = 16
+
+# one AIPlayer per pid in each worker process, searching at whatever depth
+# the request asks for; sessions only send their moves, so any worker can
+# play for any session. Set up by _init_server_worker.
+_server_players = {}
+_server_tt_mb = SERVER_TT_MB
+_server_book = None
+
+def server_processes(requested: int, tt_mb: float) -> int:
+    """Worker processes to start: no more than leave each at least
+    SERVER_MIN_WORKER_TT_MB of the `tt_mb` budget."""
+    return max(1, min(requested, int(tt_mb // SERVER_MIN_WORKER_TT_MB)))
+
+def _init_server_worker(tt_mb: float):
+    """Process-pool initializer; `tt_mb` is this worker's share of the budget."""
+    global _server_tt_mb, _server_book
+    _server_tt_mb = tt_mb
+    _server_book = load_opening_book()
+
+def _server_ai_move(depth: int, moves: str) -> int:
+    """Process-pool entry point: the AI's move for the position reached by
+    `moves` (column digits from the empty board)."""
+    pid = PLAYER1 if len(moves) % 2 == 0 else PLAYER2
+    player = _server_players.get(pid)
+    if player is None:
+        # a third of the budget for each player's table, and a third for the
+        # endgame solver's, which both players share
+        share = _server_tt_mb / 3
+        other = _server_players.get(PLAYER2 if pid == PLAYER1 else PLAYER1)
+        endgame_tt = (other.ai.endgame_solver.tt if other is not None
+                      else TranspositionTable.from_megabytes(share, replace="always"))
+        player = _server_players[pid] = AIPlayer(
+            pid, verbose=False, tt=TranspositionTable.from_megabytes(share), endgame_tt=endgame_tt)
+    player.depth = depth
+    # same book rule as App.prepare_engine
+    player.book = _server_book if depth >= 6 else None
+    return player.choose_move(board_from_moves(moves, BitBoard))
+
+class RemoteAIPlayer:
+    """Stands in for an AIPlayer in a server session; its moves are computed
+    in GameServer's process pool."""
+    __slots__ = ("pid", "depth")
+
+    def __init__(self, pid: int, depth: int):
+        self.pid = pid
+        self.depth = depth
+
+class ServerSession:
+    __slots__ = ("engine", "busy")
+
+    def __init__(self, engine: GameEngine):
+        self.engine = engine
+        # True while a request for this session is being answered
+        self.busy = False
+
+    def moves(self) -> str:
+        return "".join(str(move[1]) for move in self.engine.board.moves)
+
+class GameServer:
+    """Hosts many GameEngine sessions over TCP or a Unix socket.
+
+    AI moves go through one FIFO queue to `processes` dispatchers, each
+    keeping a single job in the shared process pool. A session can have at
+    most one move queued, so sessions are served in turn however many one
+    client opens. The queue holds at most `max_pending` moves; once it is
+    full, requests wait, each connection stops being read after
+    `max_inflight` unanswered requests, and TCP pushes back on the client.
+    """
+
+    def __init__(self, processes: int = 1, max_sessions: int = SERVER_MAX_SESSIONS,
+                 max_pending: Optional[int] = None, max_inflight: int = SERVER_MAX_INFLIGHT,
+                 max_depth: int = SERVER_MAX_DEPTH, tt_mb: float = SERVER_TT_MB):
+        # the pool is sized from the transposition-table budget as well as
+        # from the processes asked for
+        self.processes = server_processes(processes, tt_mb)
+        self.tt_mb = tt_mb
+        self.max_sessions = max_sessions
+        self.max_pending = max_pending or 4 * self.processes
+        self.max_inflight = max_inflight
+        self.max_depth = max_depth
+        self.sessions = {}
+        self.next_session = 1
+        self.ai_moves = 0
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.dispatchers: List[asyncio.Task] = []
+
+    async def start(self, host: str = "127.0.0.1", port: int = SERVER_PORT,
+                    unix_path: Optional[str] = None):
+        self.pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_server_worker,
+                                        initargs=(self.tt_mb / self.processes,))
+        self.queue = asyncio.Queue(maxsize=self.max_pending)
+        self.dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.processes)]
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_client, unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self):
+        for task in self.dispatchers:
+            task.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            depth, moves, future = await self.queue.get()
+            if future.cancelled():
+                # the requesting connection went away while it was queued
+                continue
+            try:
+                col = await loop.run_in_executor(self.pool, _server_ai_move, depth, moves)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.ai_moves += 1
+                if not future.done():
+                    future.set_result(col)
+
+    async def _ai_move(self, session: ServerSession) -> int:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((session.engine.current.depth, session.moves(), future))
+        return await future
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        owned = set()
+        inflight = asyncio.Semaphore(self.max_inflight)
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await inflight.acquire()
+                task = asyncio.create_task(self._answer(line, owned, writer, inflight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # ValueError: a line longer than the stream limit
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            for sid in owned:
+                self.sessions.pop(sid, None)
+            writer.close()
+
+    async def _answer(self, line: bytes, owned: set, writer: asyncio.StreamWriter,
+                      inflight: asyncio.Semaphore):
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+            except ValueError as e:
+                request = {}
+                response = {"ok": False, "error": f"bad request: {e}"}
+            else:
+                try:
+                    response = await self.handle_request(request, owned)
+                except (KeyError, TypeError, ValueError) as e:
+                    response = {"ok": False, "error": f"bad request: {e}"}
+                except Exception as e:
+                    response = {"ok": False, "error": f"server error: {e!r}"}
+            if "id" in request:
+                response["id"] = request["id"]
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            inflight.release()
+
+    async def handle_request(self, request: dict, owned: set) -> dict:
+        op = request.get("op")
+        if op == "stats":
+            return {"ok": True, "sessions": len(self.sessions), "pending": self.queue.qsize(),
+                    "ai_moves": self.ai_moves, "processes": self.processes}
+        if op == "new":
+            if len(self.sessions) >= self.max_sessions:
+                return {"ok": False, "error": "server full"}
+            depth = max(1, min(int(request.get("depth", 4)), self.max_depth))
+            ai_first = bool(request.get("ai_first", False))
+            human = HumanPlayer(PLAYER2 if ai_first else PLAYER1)
+            ai = RemoteAIPlayer(PLAYER1 if ai_first else PLAYER2, depth)
+            engine = GameEngine(ai, human, BitBoard) if ai_first else GameEngine(human, ai, BitBoard)
+            sid = self.next_session
+            self.next_session += 1
+            session = self.sessions[sid] = ServerSession(engine)
+            owned.add(sid)
+            response = {"ok": True, "session": sid, "you": human.pid, "ai_move": None}
+            if ai_first:
+                session.busy = True
+                try:
+                    response["ai_move"] = col = await self._ai_move(session)
+                except BaseException:
+                    # it is still the AI's turn; a move sent now would be
+                    # played under the AI's pid
+                    self.sessions.pop(sid, None)
+                    owned.discard(sid)
+                    raise
+                finally:
+                    session.busy = False
+                engine.make_move(col)
+            response["moves"] = session.moves()
+            return response
+        sid = request.get("session")
+        session = self.sessions.get(sid) if sid in owned else None
+        if session is None:
+            return {"ok": False, "error": f"no session {sid}"}
+        if op == "close":
+            self.sessions.pop(sid, None)
+            owned.discard(sid)
+            return {"ok": True}
+        if op != "move":
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        if session.busy:
+            return {"ok": False, "error": "busy"}
+        engine = session.engine
+        col = request["col"]
+        if type(col) is not int or col not in engine.board.valid_moves():
+            return {"ok": False, "error": f"illegal move {col!r}"}
+        session.busy = True
+        try:
+            winner = engine.make_move(col)
+            ai_col = None
+            if not winner and not engine.board.is_full():
+                try:
+                    ai_col = await self._ai_move(session)
+                except BaseException:
+                    # take the human's move back so the session is still
+                    # theirs to play
+                    engine.board.undo_move(col)
+                    engine.switch()
+                    raise
+                winner = engine.make_move(ai_col)
+        finally:
+            session.busy = False
+        over = bool(winner) or engine.board.is_full()
+        response = {"ok": True, "ai_move": ai_col, "moves": session.moves(),
+                    "over": over, "winner": winner or 0}
+        if over:
+            self.sessions.pop(sid, None)
+            owned.discard(sid)
+        return response
+
+async def _serve(args):
+    server = GameServer(args.processes, args.max_sessions, args.max_pending,
+                        args.max_inflight, args.max_depth, args.tt_mb)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"serving Connect 4 on {where} ({server.processes} AI processes, "
+          f"{server.tt_mb / server.processes:g} MB of transposition tables each)")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+def serve_main(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="serve", description="Multi-session game server (NDJSON)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="AI worker processes")
+    parser.add_argument("--max-sessions", type=int, default=SERVER_MAX_SESSIONS)
+    parser.add_argument("--max-pending", type=int, help="queued AI moves (default 4 per process)")
+    parser.add_argument("--max-inflight", type=int, default=SERVER_MAX_INFLIGHT,
+                        help="unanswered requests per connection before it stops being read")
+    parser.add_argument("--max-depth", type=int, default=SERVER_MAX_DEPTH)
+    parser.add_argument("--tt-mb", type=float, default=SERVER_TT_MB,
+                        help="transposition-table memory for all AI processes together; "
+                             f"fewer processes start if each would get under {SERVER_MIN_WORKER_TT_MB} MB")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+# ============================
+# LOAD GENERATOR (client for the game server)
+# ============================
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+class LoadConnection:
+    """One client connection; matches responses to requests by id so many
+    sessions can share it."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.waiting = {}
+        self.next_id = 0
+        self.receiver = asyncio.create_task(self._receive())
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.waiting.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("server closed the connection"))
+
+    async def request(self, **request) -> dict:
+        self.next_id += 1
+        request["id"] = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[self.next_id] = future
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    def close(self):
+        self.receiver.cancel()
+        self.writer.close()
+
+async def _load_session(conn: LoadConnection, rng: random.Random, depth: int, think_ms: float,
+                        stop_at: float, latencies_ms: List[float], counts: dict):
+    """Play games back to back on `conn` with random moves until stop_at."""
+    while time.perf_counter() < stop_at:
+        response = await conn.request(op="new", depth=depth, ai_first=rng.random() < 0.5)
+        if not response["ok"]:
+            counts["errors"] += 1
+            await asyncio.sleep(0.1)
+            continue
+        sid = response["session"]
+        board = board_from_moves(response["moves"], BitBoard)
+        over = False
+        while not over:
+            if time.perf_counter() >= stop_at:
+                await conn.request(op="close", session=sid)
+                return
+            if think_ms:
+                await asyncio.sleep(rng.uniform(0.5, 1.5) * think_ms / 1000)
+            col = rng.choice(board.valid_moves())
+            start = time.perf_counter()
+            response = await conn.request(op="move", session=sid, col=col)
+            if not response["ok"]:
+                counts["errors"] += 1
+                break
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            counts["moves"] += 1
+            board = board_from_moves(response["moves"], BitBoard)
+            over = response["over"]
+        counts["games"] += 1
+
+async def run_load(sessions: int, duration_s: float, depth: int = 4, think_ms: float = 200,
+                   connections: int = 16, host: str = "127.0.0.1", port: int = SERVER_PORT,
+                   unix_path: Optional[str] = None, seed: int = 0) -> dict:
+    """Drive `sessions` concurrent games against a running server for
+    `duration_s` seconds; returns move-latency percentiles and counts."""
+    conns = []
+    for _ in range(max(1, min(connections, sessions))):
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        conns.append(LoadConnection(reader, writer))
+    latencies_ms: List[float] = []
+    counts = {"moves": 0, "games": 0, "errors": 0}
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _load_session(conns[i % len(conns)], random.Random(seed * 100_003 + i), depth, think_ms,
+                          start + duration_s, latencies_ms, counts)
+            for i in range(sessions)))
+    finally:
+        for conn in conns:
+            conn.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "sessions": sessions,
+        "moves": counts["moves"],
+        "games": counts["games"],
+        "errors": counts["errors"],
+        "moves_per_sec": round(counts["moves"] / elapsed, 1),
+        "p50_ms": round(percentile(latencies_ms, 50), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+    }
+
+def loadgen_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog="loadgen", description="Load generator for the game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--unix", help="connect to this Unix socket path instead of TCP")
+    parser.add_argument("--sessions", default="10,50,100",
+                        help="concurrent sessions; a comma-separated list runs one step each")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per step")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--think-ms", type=float, default=200, help="mean client think time per move")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--slo-ms", type=float, default=250, help="p99 move latency a step must meet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    sustained = 0
+    for sessions in (int(s) for s in args.sessions.split(",") if s):
+        result = asyncio.run(run_load(sessions, args.duration, args.depth, args.think_ms,
+                                      args.connections, args.host, args.port, args.unix, args.seed))
+        ok = result["errors"] == 0 and result["moves"] > 0 and result["p99_ms"] <= args.slo_ms
+        print(f"{sessions:6} sessions: {result['moves']:,} moves ({result['moves_per_sec']:,}/s), "
+              f"p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, {result['errors']} errors"
+              f"{'' if ok else '  (over SLO)'}")
+        if not ok:
+            break
+        sustained = sessions
+    print(f"sustained: {sustained} sessions with p99 <= {args.slo_ms:g} ms")
+    return 0 if sustained else 1
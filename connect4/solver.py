@@ -0,0 +1,191 @@
+"""Perfect-play Solver for exact game-theoretic scores."""
+
+import threading
+import time
+from typing import Tuple, Optional
+
+from .board import (BOARD_MASK, BOTTOM_MASK, COLS, COLUMN_MASKS, PLAYER1, ROWS, column_mask,
+                    winning_cells)
+from .errors import SearchCancelled, SearchTimeout
+from .tt import TT_LOWER, TT_UPPER, TranspositionTable
+
+# ============================
+# PERFECT-PLAY SOLVER
+# ============================
+# Scores follow the usual convention for solved Connect 4: 0 is a draw, a
+# positive score means the side to move wins, and the sooner the win the
+# bigger the score: a win with the winner's k-th stone scores
+# ROWS * COLS // 2 + 1 - k (negative of that for a loss).
+BOARD_SIZE = ROWS * COLS
+SOLVER_COLUMN_ORDER = sorted(range(COLS), key=lambda c: abs(c - COLS // 2))
+SOLVER_BUDGET_MS = 1000
+
+SOLVER_COLUMN_MASKS = [COLUMN_MASKS[c] for c in SOLVER_COLUMN_ORDER]
+
+def board_masks(board) -> Tuple[int, int, int]:
+    """(stones of the side to move, occupied mask, number of stones) for a
+    Board or BitBoard, assuming PLAYER1 moved first and players alternated."""
+    p1, mask = board.stones(PLAYER1), board.mask
+    stones = mask.bit_count()
+    return (p1 if stones % 2 == 0 else p1 ^ mask), mask, stones
+
+def describe_solver_score(score: int, stones: int) -> str:
+    """e.g. 'win in 3 moves' for the side to move, with `stones` on the board."""
+    if score == 0:
+        return "draw"
+    # index of the winner's winning stone, minus the stones they already have
+    winner_stones = stones // 2 if score > 0 else (stones + 1) // 2
+    moves = BOARD_SIZE // 2 + 1 - abs(score) - winner_stones
+    return f"{'win' if score > 0 else 'loss'} in {moves} move{'s' if moves != 1 else ''}"
+
+class Solver:
+    """Exact solver: bitboard negamax with null-window bisection on the
+    score, a transposition table of upper bounds, and move ordering that
+    skips moves giving the opponent an immediate win and tries moves that
+    create the most threats first."""
+
+    def __init__(self, tt: Optional[TranspositionTable] = None):
+        self.tt = tt if tt is not None else TranspositionTable(1_000_000, replace="always")
+        self.nodes = 0
+        self.deadline: Optional[float] = None
+        self.cancel_event: Optional[threading.Event] = None
+
+    def solve(self, board, time_budget_ms: Optional[float] = None,
+              cancel_event: Optional[threading.Event] = None) -> int:
+        """Exact score of `board` for the side to move. Raises SearchTimeout
+        if `time_budget_ms` runs out (SearchCancelled on cancel_event)."""
+        self._start(time_budget_ms, cancel_event)
+        return self._solve(*board_masks(board))
+
+    def solve_masks(self, position: int, mask: int, stones: int, deadline: Optional[float] = None,
+                    cancel_event: Optional[threading.Event] = None) -> int:
+        """solve() for board_masks() values, stopping at the perf_counter
+        `deadline`; used by Minimax to score endgame positions."""
+        self._start(None, cancel_event)
+        self.deadline = deadline
+        return self._solve(position, mask, stones)
+
+    def best_move(self, board, time_budget_ms: Optional[float] = None,
+                  cancel_event: Optional[threading.Event] = None) -> Tuple[int, int]:
+        """(column, exact score) of a move that keeps the position's value."""
+        self._start(time_budget_ms, cancel_event)
+        position, mask, stones = board_masks(board)
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        wins = winning_cells(position, mask) & possible
+        for col in SOLVER_COLUMN_ORDER:
+            if wins & column_mask(col):
+                return col, (BOARD_SIZE + 1 - stones) // 2
+        opp = position ^ mask
+        opp_wins = winning_cells(opp, mask)
+        playable = [col for col in SOLVER_COLUMN_ORDER if possible & column_mask(col)]
+        non_losing = self._non_losing(possible, opp_wins)
+        safe = [col for col in playable if non_losing & column_mask(col)]
+        if not safe:
+            # every move loses next turn; block if there is a threat
+            forced = [col for col in playable if possible & opp_wins & column_mask(col)]
+            return (forced or playable)[0], -((BOARD_SIZE - stones) // 2)
+        value = self._solve(position, mask, stones)
+        for col in safe:
+            move = possible & column_mask(col)
+            # null window: does this move hold the opponent to -value or less?
+            threats = winning_cells(position | move, mask | move)
+            if self._negamax(opp, mask | move, stones + 1, -value, -value + 1, threats) <= -value:
+                return col, value
+        return safe[0], value
+
+    def _start(self, time_budget_ms: Optional[float], cancel_event: Optional[threading.Event]):
+        self.nodes = 0
+        self.cancel_event = cancel_event
+        self.deadline = None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000
+
+    def _check_stop(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SearchCancelled()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    @staticmethod
+    def _non_losing(possible: int, opp_wins: int) -> int:
+        forced = possible & opp_wins
+        if forced:
+            if forced & (forced - 1):
+                # two threats at once: nothing saves the game
+                return 0
+            possible = forced
+        # never play directly below an opponent's winning cell
+        return possible & ~(opp_wins >> 1)
+
+    def _solve(self, position: int, mask: int, stones: int) -> int:
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        if winning_cells(position, mask) & possible:
+            return (BOARD_SIZE + 1 - stones) // 2
+        opp_wins = winning_cells(position ^ mask, mask)
+        lo = -((BOARD_SIZE - stones) // 2)
+        hi = (BOARD_SIZE + 1 - stones) // 2
+        # bisect the score with null-window searches, probing near 0 first
+        while lo < hi:
+            med = lo + (hi - lo) // 2
+            if med <= 0 and int(lo / 2) < med:
+                med = int(lo / 2)
+            elif med >= 0 and int(hi / 2) > med:
+                med = int(hi / 2)
+            r = self._negamax(position, mask, stones, med, med + 1, opp_wins)
+            if r <= med:
+                hi = r
+            else:
+                lo = r
+        return lo
+
+    def _negamax(self, position: int, mask: int, stones: int, alpha: int, beta: int,
+                 opp_wins: int) -> int:
+        # precondition: the side to move cannot win immediately; opp_wins is
+        # winning_cells() of the opponent, which the caller already has from
+        # ordering its moves
+        self.nodes += 1
+        if self.nodes & 4095 == 0:
+            self._check_stop()
+        opp = position ^ mask
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        non_losing = self._non_losing(possible, opp_wins)
+        if not non_losing:
+            return -((BOARD_SIZE - stones) // 2)
+        if stones >= BOARD_SIZE - 2:
+            return 0
+        lo = -((BOARD_SIZE - 2 - stones) // 2)
+        if alpha < lo:
+            alpha = lo
+            if alpha >= beta:
+                return alpha
+        hi = (BOARD_SIZE - 1 - stones) // 2
+        key = position + mask
+        entry = self.tt.get(key)
+        if entry is not None:
+            if entry[2] == TT_LOWER:
+                if alpha < entry[1]:
+                    alpha = entry[1]
+                    if alpha >= beta:
+                        return alpha
+            else:
+                hi = entry[1]
+        if beta > hi:
+            beta = hi
+            if alpha >= beta:
+                return beta
+        candidates = []
+        for i, cmask in enumerate(SOLVER_COLUMN_MASKS):
+            move = non_losing & cmask
+            if move:
+                threats = winning_cells(position | move, mask | move)
+                # most new threats first, center-first among equals; the
+                # rank is unique so the tuples never compare past it
+                candidates.append((i - 8 * threats.bit_count(), move, threats))
+        candidates.sort()
+        for _, move, threats in candidates:
+            score = -self._negamax(opp, mask | move, stones + 1, -beta, -alpha, threats)
+            if score >= beta:
+                self.tt.store(key, 0, score, TT_LOWER, None)
+                return score
+            if score > alpha:
+                alpha = score
+        self.tt.store(key, 0, alpha, TT_UPPER, None)
+        return alpha
@@ -0,0 +1,74 @@
+"""Transposition table shared by Minimax and Solver."""
+
+from collections import OrderedDict
+from typing import Tuple, Optional
+
+# ============================
+# TRANSPOSITION TABLE
+# ============================
+TT_EXACT = 0
+TT_LOWER = 1  # score is a lower bound (search failed high)
+TT_UPPER = 2  # score is an upper bound (search failed low)
+# rough CPython cost of one entry (OrderedDict slot, key tuple, value tuple)
+TT_ENTRY_BYTES = 240
+
+class TranspositionTable:
+    """Bounded position cache with least-recently-used eviction.
+
+    Entries are (depth, score, flag, best_move) tuples. When a key is stored
+    again, replace="depth" keeps the existing entry if it was searched deeper,
+    replace="always" overwrites it.
+    """
+
+    def __init__(self, max_entries: int = 200_000, replace: str = "depth"):
+        if replace not in ("depth", "always"):
+            raise ValueError("replace must be 'depth' or 'always'")
+        self.max_entries = max_entries
+        self.replace = replace
+        self.entries: "OrderedDict[object, Tuple[int, int, int, Optional[int]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_megabytes(cls, megabytes: float, replace: str = "depth"):
+        return cls(max(1, int(megabytes * 1024 * 1024 / TT_ENTRY_BYTES)), replace)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key, depth: int, score, flag: int, best_move: Optional[int]):
+        old = self.entries.get(key)
+        if old is not None:
+            self.entries.move_to_end(key)
+            if self.replace == "depth" and old[0] > depth:
+                return
+        elif len(self.entries) >= self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[key] = (depth, score, flag, best_move)
+        self.stores += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "approx_bytes": len(self.entries) * TT_ENTRY_BYTES,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,64 @@
+"""batch_evaluate against the per-board score_position and check_winner."""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from connect4 import batch
+from connect4.board import BOARD_CLASSES, PLAYER1, PLAYER2
+
+def random_boards(rng: random.Random, count: int, board_cls):
+    """Positions from random games, including finished ones."""
+    boards = []
+    while len(boards) < count:
+        board = board_cls()
+        player = PLAYER1
+        for _ in range(rng.randrange(43)):
+            if board.check_winner() or board.is_full():
+                break
+            board.drop_piece(rng.choice(board.valid_moves()), player)
+            player = PLAYER1 if player == PLAYER2 else PLAYER2
+        boards.append(board)
+    return boards
+
+def expected(boards, players):
+    scores = [b.score_position(p) for b, p in zip(boards, players)]
+    winners = [b.check_winner() or 0 for b in boards]
+    return scores, winners
+
+def test_grids_and_masks_match_boards(monkeypatch):
+    # several chunks per call, the last one partial
+    monkeypatch.setattr(batch, "BATCH_CHUNK", 7)
+    rng = random.Random(23)
+    for board_cls in BOARD_CLASSES.values():
+        boards = random_boards(rng, 60, board_cls)
+        for player in (PLAYER1, PLAYER2):
+            scores, winners = expected(boards, [player] * len(boards))
+            for packed in (batch.pack_grids(boards), batch.pack_masks(boards)):
+                got_scores, got_winners = batch.batch_evaluate(packed, player)
+                assert got_scores.tolist() == scores
+                assert got_winners.tolist() == winners
+
+def test_player_per_position(monkeypatch):
+    monkeypatch.setattr(batch, "BATCH_CHUNK", 16)
+    rng = random.Random(24)
+    for board_cls in BOARD_CLASSES.values():
+        boards = random_boards(rng, 50, board_cls)
+        players = [rng.choice((PLAYER1, PLAYER2)) for _ in boards]
+        scores, winners = expected(boards, players)
+        for packed in (batch.pack_grids(boards), batch.pack_masks(boards)):
+            got_scores, got_winners = batch.batch_evaluate(packed, np.array(players))
+            assert got_scores.tolist() == scores
+            assert got_winners.tolist() == winners
+        got_scores, _ = batch.evaluate_boards(boards, players)
+        assert got_scores.tolist() == scores
+
+def test_bad_shape_is_rejected():
+    with pytest.raises(ValueError):
+        batch.batch_evaluate(np.zeros((3, 5, 7), dtype=np.int8))
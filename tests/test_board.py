@@ -0,0 +1,63 @@
+"""BitBoard against Board: the same moves must give the same answers."""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connect4.board import COLS, ROWS, Board, BitBoard, PLAYER1, PLAYER2
+
+def assert_same(board: Board, bit: BitBoard):
+    assert [list(row) for row in board.grid] == [list(row) for row in bit.grid]
+    assert board.valid_moves() == bit.valid_moves()
+    assert board.is_full() == bit.is_full()
+    assert board.check_winner() == bit.check_winner()
+    assert board.winning_positions() == bit.winning_positions()
+    assert board.last_move_wins() == bit.last_move_wins()
+    for player in (PLAYER1, PLAYER2):
+        assert board.score_position(player) == bit.score_position(player)
+        assert board.stones(player) == bit.stones(player)
+        for col in range(COLS):
+            assert board.is_winning_move(col, player) == bit.is_winning_move(col, player)
+    for col in range(COLS):
+        assert board.height(col) == bit.height(col)
+
+def test_random_games_match():
+    rng = random.Random(1)
+    for _ in range(60):
+        board, bit = Board(), BitBoard()
+        player = PLAYER1
+        while not board.check_winner() and not board.is_full():
+            col = rng.choice(board.valid_moves())
+            assert board.drop_piece(col, player) and bit.drop_piece(col, player)
+            assert_same(board, bit)
+            player = PLAYER1 if player == PLAYER2 else PLAYER2
+
+def test_undo_restores_the_position():
+    rng = random.Random(2)
+    for _ in range(20):
+        board, bit = Board(), BitBoard()
+        played = []
+        player = PLAYER1
+        for _ in range(rng.randrange(ROWS * COLS)):
+            col = rng.choice(board.valid_moves())
+            board.drop_piece(col, player)
+            bit.drop_piece(col, player)
+            played.append(col)
+            player = PLAYER1 if player == PLAYER2 else PLAYER2
+        while played:
+            col = played.pop()
+            assert board.undo_move(col) and bit.undo_move(col)
+            assert_same(board, bit)
+        assert board.valid_moves() == bit.valid_moves() == list(range(COLS))
+
+def test_full_column_is_refused():
+    board, bit = Board(), BitBoard()
+    for i in range(ROWS):
+        player = PLAYER1 if i % 2 == 0 else PLAYER2
+        board.drop_piece(0, player)
+        bit.drop_piece(0, player)
+    assert board.drop_piece(0, PLAYER1) is False
+    assert bit.drop_piece(0, PLAYER1) is False
+    assert_same(board, bit)
@@ -0,0 +1,55 @@
+"""Incremental evaluation against a full rescan of the board."""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connect4.board import BOARD_CLASSES, PLAYER1, PLAYER2, board_from_moves
+from connect4.search import Minimax
+
+def rescanned(board_cls, played: list):
+    """A board without eval tracking, so score_position scans every window."""
+    return board_from_moves("".join(map(str, played)), board_cls)
+
+def test_tracked_score_matches_rescan():
+    rng = random.Random(9)
+    for board_cls in BOARD_CLASSES.values():
+        for _ in range(30):
+            board = board_cls()
+            board.enable_eval_tracking()
+            played = []
+            while not board.check_winner() and not board.is_full():
+                # mostly play on, sometimes take moves back
+                if played and rng.random() < 0.3:
+                    assert board.undo_move(played.pop())
+                else:
+                    col = rng.choice(board.valid_moves())
+                    board.drop_piece(col, PLAYER1 if len(played) % 2 == 0 else PLAYER2)
+                    played.append(col)
+                full = rescanned(board_cls, played)
+                for player in (PLAYER1, PLAYER2):
+                    assert board.score_position(player) == full.score_position(player), played
+                # copies keep tracking
+                assert board.copy().score_position(PLAYER1) == full.score_position(PLAYER1)
+
+def test_search_matches_without_incremental_eval():
+    rng = random.Random(10)
+    for board_cls in BOARD_CLASSES.values():
+        for _ in range(6):
+            moves = ""
+            board = board_cls()
+            stones = rng.randrange(4, 20)
+            while len(moves) < stones:
+                player = PLAYER1 if len(moves) % 2 == 0 else PLAYER2
+                cols = [c for c in board.valid_moves() if not board.is_winning_move(c, player)]
+                if not cols:
+                    break
+                col = rng.choice(cols)
+                board.drop_piece(col, player)
+                moves += str(col)
+            player = PLAYER1 if len(moves) % 2 == 0 else PLAYER2
+            tracked, rescan = Minimax(incremental_eval=True), Minimax(incremental_eval=False)
+            assert tracked.best_move(board, 4, player) == rescan.best_move(board, 4, player), moves
+            assert tracked.last_score == rescan.last_score, moves
@@ -0,0 +1,42 @@
+"""PVS against the two-sided minimax search: same root value at every depth."""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connect4.bench import BENCH_POSITIONS
+from connect4.board import BOARD_CLASSES, BitBoard, PLAYER1, PLAYER2, board_from_moves
+from connect4.search import Minimax
+
+def random_moves(rng: random.Random, stones: int) -> str:
+    """Moves of a game `stones` long in which nobody has won."""
+    board = BitBoard()
+    moves = ""
+    while len(moves) < stones:
+        player = PLAYER1 if len(moves) % 2 == 0 else PLAYER2
+        cols = [c for c in board.valid_moves() if not board.is_winning_move(c, player)]
+        if not cols:
+            return moves
+        col = rng.choice(cols)
+        board.drop_piece(col, player)
+        moves += str(col)
+    return moves
+
+def test_pvs_root_value_matches_minimax():
+    rng = random.Random(14)
+    positions = [m for ms in BENCH_POSITIONS.values() for m in ms]
+    positions += [random_moves(rng, rng.randrange(2, 24)) for _ in range(8)]
+    for moves in positions:
+        player = PLAYER1 if len(moves) % 2 == 0 else PLAYER2
+        for board_cls in BOARD_CLASSES.values():
+            board = board_from_moves(moves, board_cls)
+            for depth in (1, 3, 5):
+                for use_tt in (True, False):
+                    minimax = Minimax(use_tt=use_tt)
+                    pvs = Minimax(algorithm="pvs", use_tt=use_tt)
+                    minimax.best_move(board, depth, player)
+                    col = pvs.best_move(board, depth, player)
+                    assert col in board.valid_moves()
+                    assert pvs.last_score == minimax.last_score, (moves, depth, use_tt)
@@ -0,0 +1,70 @@
+"""Solver against a brute-force negamax on nearly full boards."""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connect4.board import BOARD_CLASSES, BitBoard, PLAYER1, PLAYER2
+from connect4.solver import BOARD_SIZE, Solver
+
+def random_position(rng: random.Random, empty: int, board_cls=BitBoard):
+    """A position with `empty` empty cells that nobody has won yet and the
+    side to move cannot win at once."""
+    while True:
+        board = board_cls()
+        player = PLAYER1
+        while BOARD_SIZE - len(board.moves) > empty:
+            cols = [c for c in board.valid_moves() if not board.is_winning_move(c, player)]
+            if not cols:
+                break
+            board.drop_piece(rng.choice(cols), player)
+            player = PLAYER1 if player == PLAYER2 else PLAYER2
+        else:
+            if not any(board.is_winning_move(c, player) for c in board.valid_moves()):
+                return board
+
+def negamax(board, memo: dict) -> int:
+    """Exact score for the side to move, in the Solver's convention."""
+    key = board.key
+    if key in memo:
+        return memo[key]
+    stones = len(board.moves)
+    player = PLAYER1 if stones % 2 == 0 else PLAYER2
+    cols = board.valid_moves()
+    if any(board.is_winning_move(c, player) for c in cols):
+        score = (BOARD_SIZE + 1 - stones) // 2
+    elif not cols:
+        score = 0
+    else:
+        score = -BOARD_SIZE
+        for col in cols:
+            board.drop_piece(col, player)
+            score = max(score, -negamax(board, memo))
+            board.undo_move(col)
+    memo[key] = score
+    return score
+
+def test_solve_matches_negamax():
+    rng = random.Random(15)
+    memo = {}
+    for empty in (4, 6, 8, 10) * 5:
+        board = random_position(rng, empty)
+        assert Solver().solve(board) == negamax(board, memo), board.moves
+
+def test_best_move_keeps_the_value():
+    rng = random.Random(16)
+    for board_cls in BOARD_CLASSES.values():
+        memo = {}
+        for empty in (5, 7, 9, 10) * 3:
+            board = random_position(rng, empty, board_cls)
+            expected = negamax(board, memo)
+            col, score = Solver().best_move(board)
+            assert score == expected, board.moves
+            player = PLAYER1 if len(board.moves) % 2 == 0 else PLAYER2
+            if board.is_winning_move(col, player):
+                assert score == (BOARD_SIZE + 1 - len(board.moves)) // 2
+            else:
+                board.drop_piece(col, player)
+                assert -negamax(board, memo) == expected, board.moves